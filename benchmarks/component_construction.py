@@ -0,0 +1,64 @@
+"""Construction cost of many components.
+
+Creates 10k list-item components inside a page, the way a page function
+does: each one validates its props, registers itself in the session and
+adds its loader container to the page.
+
+Run from the repository root:
+    python -m benchmarks.component_construction
+"""
+
+import time
+
+from lazyfast import Component, LazyFastRouter, context, tags
+from lazyfast.session import Session
+from lazyfast.state import State
+
+ITEMS = 10_000
+RUNS = 5
+LABELS = ["new", "urgent", "backend"]
+
+router = LazyFastRouter()
+
+
+@router.component(class_="item")
+class Item(Component):
+    index: int
+    title: str
+    done: bool = False
+    labels: list[str] = []
+
+    async def view(self):
+        tags.span(self.title)
+
+
+def build_page() -> float:
+    session = Session(
+        session_id="benchmark", state=State(), buffer_size=1, max_components=None
+    )
+    context.set_session(session)
+    context.clear_root_tags()
+
+    start = time.perf_counter()
+    with tags.ul() as root:
+        for i in range(ITEMS):
+            Item(index=i, title=f"item {i}", labels=LABELS)
+    elapsed = time.perf_counter() - start
+
+    assert len(session._components) == ITEMS
+    assert len(root.children) == ITEMS
+    context.clear_root_tags()
+    return elapsed
+
+
+def main():
+    build_page()  # warm up
+    best = min(build_page() for _ in range(RUNS))
+    print(
+        f"{ITEMS} components: {best * 1000:7.1f} ms "
+        f"({best / ITEMS * 1e6:5.1f} us each, best of {RUNS})"
+    )
+
+
+if __name__ == "__main__":
+    main()
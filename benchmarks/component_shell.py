@@ -0,0 +1,70 @@
+"""Instantiation cost of components on a page with many list items.
+
+Creates a list with hundreds of small components, the way a page function
+does, and reports the time to instantiate them (including their loader
+containers and skeletons) and to render the page html.
+
+Run from the repository root:
+    python -m benchmarks.component_shell
+"""
+
+import time
+
+from lazyfast import Component, LazyFastRouter, context, tags
+from lazyfast.session import Session
+from lazyfast.state import State
+
+ITEMS = 500
+RUNS = 20
+
+router = LazyFastRouter()
+
+
+def skeleton():
+    with tags.div(class_="skeleton"):
+        tags.span(class_="skeleton-line")
+        tags.span(class_="skeleton-line short")
+
+
+@router.component(class_="item", preload_renderer=skeleton, cache_preload=True)
+class Item(Component):
+    index: int
+
+    async def view(self):
+        tags.span(f"item {self.index}")
+
+
+def build_page() -> tuple[float, float]:
+    session = Session(session_id="benchmark", state=State(), buffer_size=1)
+    context.set_session(session)
+    context.clear_root_tags()
+
+    start = time.perf_counter()
+    with tags.ul() as root:
+        for i in range(ITEMS):
+            with tags.li():
+                Item(index=i)
+    instantiated = time.perf_counter()
+    root.html()
+    rendered = time.perf_counter()
+
+    context.clear_root_tags()
+    return instantiated - start, rendered - instantiated
+
+
+def main():
+    build_page()  # warm up
+
+    timings = [build_page() for _ in range(RUNS)]
+    instantiate = min(timing[0] for timing in timings)
+    render = min(timing[1] for timing in timings)
+
+    print(
+        f"{ITEMS} components: instantiate {instantiate * 1000:6.2f} ms "
+        f"({instantiate / ITEMS * 1e6:5.1f} us each), render {render * 1000:6.2f} ms "
+        f"(best of {RUNS})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cold misses of a cached fragment under concurrent requests.
+
+Renders the same slow async fragment from many sessions at once and counts
+how many times the function actually ran. With the session scope every
+session renders it; with the global scope concurrent misses wait for a
+single render and later sessions are served from the shared cache.
+
+Run from the repository root:
+    python -m benchmarks.global_cache
+"""
+
+import asyncio
+import time
+
+from lazyfast import context, tags
+from lazyfast.cache import cache, global_cache
+from lazyfast.session import Session
+from lazyfast.state import State
+
+REQUESTS = 1000
+RENDER_TIME = 0.05
+
+renders = 0
+
+
+async def price_list():
+    global renders
+    renders += 1
+    await asyncio.sleep(RENDER_TIME)
+    with tags.ul():
+        for i in range(100):
+            tags.li(f"item {i}: {i * 1.5:.2f}")
+
+
+async def request(fragment) -> str:
+    context.set_session(Session(session_id="benchmark", state=State(), buffer_size=1))
+    context.clear_root_tags()
+    await fragment()
+    return "".join(tag.html() for tag in context.get_root_tags())
+
+
+async def measure(scope: str) -> tuple[float, int, int]:
+    global renders
+    renders = 0
+    global_cache.clear()
+    fragment = cache(scope=scope)(price_list)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(request(fragment) for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+
+    return elapsed, renders, len(set(results))
+
+
+async def main():
+    for scope in ("session", "global"):
+        elapsed, count, distinct = await measure(scope)
+        print(
+            f"{scope:<8} {REQUESTS} concurrent misses: {elapsed * 1000:7.1f} ms, "
+            f"{count} renders, {distinct} distinct responses"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
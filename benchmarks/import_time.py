@@ -0,0 +1,60 @@
+"""Time spent importing lazyfast, without its dependencies.
+
+Imports lazyfast in fresh interpreters with `-X importtime`, sums the self
+time of the lazyfast modules and takes the best of several runs. Exits with
+status 1 if it exceeds the budget, if the element classes of `tags` were
+imported eagerly or if the import opened a network connection.
+
+Run from the repository root:
+    python -m benchmarks.import_time
+"""
+
+import subprocess
+import sys
+
+RUNS = 5
+BUDGET_MS = 40
+
+CHECK = """
+import socket, sys
+def connect(*args, **kwargs):
+    raise RuntimeError("network access during import")
+socket.socket.connect = connect
+import lazyfast
+assert "lazyfast.elements" not in sys.modules, "element classes imported eagerly"
+"""
+
+
+def measure() -> dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHECK],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        if name.strip().startswith("lazyfast"):
+            times[name.strip()] = int(self_time) / 1000
+    return times
+
+
+def main():
+    best = min((measure() for _ in range(RUNS)), key=lambda times: sum(times.values()))
+    total = sum(best.values())
+
+    for name, elapsed in sorted(best.items(), key=lambda item: -item[1]):
+        print(f"{name:<20} {elapsed:6.1f} ms")
+    print(f"{'total':<20} {total:6.1f} ms (budget {BUDGET_MS} ms)")
+
+    if total > BUDGET_MS:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
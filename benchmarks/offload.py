@@ -0,0 +1,94 @@
+"""CPU-heavy fragments rendered inline and with `offload`.
+
+Renders a large computed table from several concurrent requests, once
+directly in the async view and once with `offload`, and reports the total
+time, the lag of a ticker task on the event loop and the cost of a single
+offloaded call. Inline renders hold the event loop and the GIL for their
+whole duration. Offloaded ones run in worker processes, in parallel if
+there are several CPUs.
+
+Run from the repository root:
+    python -m benchmarks.offload
+"""
+
+import asyncio
+import os
+import time
+
+from lazyfast import context, offload, tags
+from lazyfast.session import Session
+from lazyfast.state import State
+
+REQUESTS = 8
+ROWS = 3000
+TICK = 0.005
+
+
+def report_table(rows: int) -> int:
+    total = 0
+    with tags.table(class_="report"):
+        for i in range(rows):
+            value = sum(j * j for j in range(i % 50))
+            total += value
+            with tags.tr():
+                tags.td(str(i))
+                tags.td(f"{value:,}", class_="number")
+    return total
+
+
+async def request(offloaded: bool) -> tuple[int, str]:
+    context.set_session(Session(session_id="benchmark", state=State(), buffer_size=1))
+    context.clear_root_tags()
+    with tags.div(id="report") as root:
+        if offloaded:
+            total = await offload(report_table, ROWS)
+        else:
+            total = report_table(ROWS)
+    return total, root.html()
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        max_lag = max(max_lag, time.perf_counter() - start - TICK)
+    return max_lag
+
+
+async def measure(offloaded: bool) -> tuple[float, float, set[tuple[int, str]]]:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(ticker(stop))
+    await asyncio.sleep(TICK)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(request(offloaded) for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    return elapsed, await lag, set(results)
+
+
+async def main():
+    # start the worker processes before measuring
+    await asyncio.gather(*(offload(report_table, 1) for _ in range(os.cpu_count() or 1)))
+
+    outputs = set()
+    for offloaded in (False, True):
+        elapsed, max_lag, results = await measure(offloaded)
+        outputs |= results
+        print(
+            f"{'offload' if offloaded else 'inline':<8} {REQUESTS} concurrent renders: "
+            f"{elapsed * 1000:7.1f} ms, max event loop lag {max_lag * 1000:6.1f} ms"
+        )
+    assert len(outputs) == 1, "offloaded render differs from inline render"
+
+    start = time.perf_counter()
+    for _ in range(50):
+        await offload(report_table, 1)
+    overhead = (time.perf_counter() - start) / 50
+    print(f"overhead of one offloaded call: {overhead * 1000:.2f} ms ({os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
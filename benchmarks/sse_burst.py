@@ -0,0 +1,92 @@
+"""Latency of delivering a burst of component reloads over SSE.
+
+Enqueues a burst of reloads for distinct components and measures the time
+until all of them reach the client, and the number of SSE messages used.
+With the previous fixed 0.5 s sleep after every event, the same burst took
+BURST * 0.5 seconds.
+
+Run from the repository root:
+    python -m benchmarks.sse_burst
+"""
+
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from lazyfast import BaseState, LazyFastRouter
+from lazyfast.session import SessionStorage
+
+BURST = 50
+
+
+class State(BaseState):
+    counter: int = 0
+
+
+async def measure(tick_interval: float) -> tuple[float, int]:
+    router = LazyFastRouter(state_schema=State, sse_tick_interval=tick_interval)
+    app = FastAPI()
+    app.include_router(router)
+
+    session = await SessionStorage.create_session(State())
+    disconnect = asyncio.Event()
+    delivered = asyncio.Event()
+    received: set[str] = set()
+    messages = 0
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/__lazyfast__/sse",
+        "raw_path": b"/__lazyfast__/sse",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"cookie", f"sid={session.id}".encode())],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal messages
+        if message["type"] == "http.response.body" and message.get("body"):
+            for event in message["body"].decode().split("\n\n"):
+                if lines := [line[6:] for line in event.split("\n") if line]:
+                    messages += 1
+                    received.update(lines)
+            if len(received) >= BURST:
+                delivered.set()
+
+    stream = asyncio.create_task(app(scope, receive, send))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    for i in range(BURST):
+        await session.state.enqueue(f"component-{i}")
+    await delivered.wait()
+    elapsed = time.perf_counter() - start
+
+    disconnect.set()
+    stream.cancel()
+    await SessionStorage.delete_session(session.id)
+    return elapsed, messages
+
+
+async def main():
+    for tick_interval in (0, 0.05, 0.5):
+        elapsed, messages = await measure(tick_interval)
+        print(
+            f"min interval: {tick_interval:<5} burst of {BURST}: "
+            f"{elapsed * 1000:7.1f} ms in {messages} messages"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
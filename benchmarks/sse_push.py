@@ -0,0 +1,138 @@
+"""End-to-end latency of a component update triggered by a state commit.
+
+Commits a state change and measures the time until the client has the new
+html of the subscribed component. In the default mode the SSE message only
+carries the component id and the client requests the html with a reload
+POST. With `sse_push_html=True` the html arrives in the SSE message itself.
+
+Client and server run in one process, so the network adds nothing here.
+In a real deployment the default mode also pays one extra round trip per
+update on top of the reported numbers.
+
+Run from the repository root:
+    python -m benchmarks.sse_push
+"""
+
+import asyncio
+import re
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from lazyfast import BaseState, Component, LazyFastRouter, tags
+from lazyfast.session import SessionStorage
+
+UPDATES = 200
+
+
+class State(BaseState):
+    counter: int = 0
+
+
+def build_app(push: bool) -> FastAPI:
+    router = LazyFastRouter(state_schema=State, sse_push_html=push)
+
+    @router.component(id="counter", reload_on=[State.counter])
+    class Counter(Component):
+        async def view(self, state: State = Depends(State.load)):
+            with tags.div():
+                tags.input(name="query", value="", placeholder="Search")
+                for i in range(20):
+                    tags.p(f"row {i}: {state.counter}")
+
+    @router.page("/")
+    def index():
+        Counter()
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def measure(push: bool) -> list[float]:
+    app = build_app(push)
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+    page = (await client.get("/")).text
+    url = re.search(r'hx-post="([^"]+)"', page).group(1).replace("&amp;", "&")
+    csrf = re.search(r'value="([0-9a-f]{64})"', page).group(1)
+    form = {"csrf": csrf, "query": "shoes"}
+    await client.post(url, data=form)
+
+    session = await SessionStorage.get_session(client.cookies["sid"])
+    events: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+    disconnect = asyncio.Event()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/__lazyfast__/sse",
+        "raw_path": b"/__lazyfast__/sse",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"cookie", f"sid={session.id}".encode())],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] != "http.response.body" or not message.get("body"):
+            return
+        for event in message["body"].decode().split("\n\n"):
+            lines = [line for line in event.split("\n") if line]
+            if not lines:
+                continue
+            kind = "html" if lines[0] == "event: html" else "id"
+            data = [line[6:] for line in lines if line.startswith("data: ")]
+            events.put_nowait((kind, "\n".join(data)))
+
+    stream = asyncio.create_task(app(scope, receive, send))
+    await asyncio.sleep(0.05)
+
+    latencies = []
+    for _ in range(UPDATES):
+        start = time.perf_counter()
+        async with session.state as state:
+            state.counter += 1
+
+        kind, data = await events.get()
+        if kind == "id":
+            html = (await client.post(url, data=form)).text
+        else:
+            html = data.split("\n", 1)[1]
+
+        assert f": {session.state.counter}</p>" in html
+        assert 'value="shoes"' in html
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    disconnect.set()
+    stream.cancel()
+    await client.aclose()
+    await SessionStorage.delete_session(session.id)
+    return latencies
+
+
+async def main():
+    for push, extra_round_trips in ((False, 1), (True, 0)):
+        latencies = await measure(push)
+        print(
+            f"{'push html' if push else 'id + reload POST':<17} "
+            f"median {statistics.median(latencies):6.2f} ms, "
+            f"p95 {statistics.quantiles(latencies, n=20)[-1]:6.2f} ms, "
+            f"+{extra_round_trips} round trip per update"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
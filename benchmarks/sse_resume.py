@@ -0,0 +1,46 @@
+"""Cost of resuming an SSE stream after a reconnect.
+
+Fills the event buffer of a session with reload events of a few
+components that reload again and again, then resumes from an event
+near the end, the usual case after a short connection break. Resuming
+looks up the position of the event by its sequence number, so the cost
+doesn't grow with the buffer size. The replayed ids are checked, even
+though the same component ids recur in the buffer.
+
+Run from the repository root:
+    python -m benchmarks.sse_resume
+"""
+
+import time
+
+from lazyfast.session import Session
+
+BUFFER_SIZES = (10, 1_000, 100_000)
+COMPONENTS = 5
+MISSED = 3
+RUNS = 1000
+
+
+def main():
+    for buffer_size in BUFFER_SIZES:
+        session = Session(session_id="benchmark", buffer_size=buffer_size)
+        for i in range(buffer_size):
+            session._events.extend([f"cid_{i % COMPONENTS}"])
+
+        last_event_id = session.last_event_id - MISSED
+        expected = [f"cid_{i % COMPONENTS}" for i in range(buffer_size - MISSED, buffer_size)]
+        assert session.get_missed_events(last_event_id) == expected
+
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            session.get_missed_events(last_event_id)
+        elapsed = (time.perf_counter() - start) / RUNS
+
+        print(
+            f"buffer of {buffer_size:>7} events: resume after {MISSED} missed events "
+            f"{elapsed * 1e6:6.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Cost of `async with state` blocks on a state with 10k-item list fields.
+
+Compares incremental dirty tracking of `State.commit` with the previous
+implementation, which dumped and compared the whole state.
+
+Run from the repository root:
+    python -m benchmarks.state_commit
+"""
+
+import asyncio
+import time
+
+from pydantic import BaseModel
+
+from lazyfast import BaseState
+
+ITEMS = 10_000
+COMMITS = 200
+
+
+class Message(BaseModel):
+    role: str
+    text: str
+
+
+class State(BaseState):
+    counter: int = 0
+    messages: list[Message] = []
+    results: list[str] = []
+
+
+def legacy_changed_fields(before: dict, after: dict) -> set[str]:
+    return {key for key in before.keys() | after.keys() if before.get(key) != after.get(key)}
+
+
+async def run(name: str, change) -> None:
+    state = State(
+        messages=[Message(role="user", text=f"message {i}") for i in range(ITEMS)],
+        results=[f"result {i}" for i in range(ITEMS)],
+    )
+    state.set_queue(asyncio.Queue())
+
+    start = time.perf_counter()
+    for _ in range(COMMITS):
+        before = state.model_dump()
+        change(state)
+        legacy_changed_fields(before, state.model_dump())
+    legacy = (time.perf_counter() - start) / COMMITS
+
+    start = time.perf_counter()
+    for _ in range(COMMITS):
+        async with state:
+            change(state)
+    tracked = (time.perf_counter() - start) / COMMITS
+
+    print(
+        f"{name:<16} legacy: {legacy * 1000:8.3f} ms  "
+        f"tracked: {tracked * 1000:8.3f} ms  ({legacy / tracked:.0f}x)"
+    )
+
+
+async def main():
+    await run("scalar change", lambda state: setattr(state, "counter", state.counter + 1))
+    await run("list append", lambda state: state.results.append("new"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""Cost of routing a state change to reloaded components.
+
+Registers a growing number of component classes with `reload_on` and mounts
+a single one of them in the session. Committing a change must only enqueue
+the mounted component, so the commit cost stays flat.
+
+Run from the repository root:
+    python -m benchmarks.state_routing
+"""
+
+import asyncio
+import time
+
+from lazyfast import BaseState, Component, LazyFastRouter, context
+from lazyfast.session import SessionStorage
+
+COMMITS = 2000
+
+
+class State(BaseState):
+    counter: int = 0
+
+
+async def measure(registered: int) -> tuple[float, int]:
+    router = LazyFastRouter(state_schema=State)
+    classes = [
+        router.component(id=f"c{i}", reload_on=[State.counter])(
+            type(f"C{i}", (Component,), {"view": lambda self: None})
+        )
+        for i in range(registered)
+    ]
+
+    session = await SessionStorage.create_session(State())
+    context.set_session(session)
+    context.clear_root_tags()
+    classes[0]()
+    context.clear_root_tags()
+
+    state = session.state
+    start = time.perf_counter()
+    for _ in range(COMMITS):
+        async with state:
+            state.counter += 1
+    elapsed = time.perf_counter() - start
+
+    enqueued = state._queue.qsize()
+    await SessionStorage.delete_session(session.id)
+    return elapsed / COMMITS, enqueued // COMMITS
+
+
+async def main():
+    for registered in (10, 100, 1000, 5000):
+        per_commit, enqueued = await measure(registered)
+        print(
+            f"registered classes: {registered:>5}  "
+            f"enqueued per commit: {enqueued}  commit: {per_commit * 1e6:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Time-to-first-byte of buffered vs streaming component responses.
+
+The view renders a large table in several batches with an await between
+them, like a view that loads rows page by page.
+
+Run from the repository root:
+    python -m benchmarks.streaming_ttfb
+"""
+
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from lazyfast import LazyFastRouter, tags
+
+BATCHES = 10
+ROWS_PER_BATCH = 500
+BATCH_DELAY = 0.01
+
+router = LazyFastRouter()
+
+
+async def big_table():
+    tags.h1("Report")
+    for batch in range(BATCHES):
+        await asyncio.sleep(BATCH_DELAY)
+        with tags.table():
+            for row in range(ROWS_PER_BATCH):
+                with tags.tr():
+                    tags.td(str(batch))
+                    tags.td(str(row))
+
+
+router.page("/buffered")(big_table)
+router.page("/streaming", stream=True)(big_table)
+
+app = FastAPI()
+app.include_router(router)
+
+
+async def measure(path: str) -> tuple[float, float, int]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    first_byte = None
+    size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal first_byte, size
+        if message["type"] == "http.response.body" and message.get("body"):
+            first_byte = first_byte or time.perf_counter()
+            size += len(message["body"])
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    return first_byte - start, time.perf_counter() - start, size
+
+
+async def main():
+    for path in ("/buffered", "/streaming"):
+        await measure(path)  # warm up
+        ttfb, total, size = await measure(path)
+        print(
+            f"{path:<11} ttfb: {ttfb * 1000:7.1f} ms  "
+            f"total: {total * 1000:7.1f} ms  size: {size} bytes"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
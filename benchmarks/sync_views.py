@@ -0,0 +1,92 @@
+"""Event loop responsiveness while sync views block.
+
+Sends concurrent reloads of components whose sync view blocks for a while,
+like a database call, and measures the lag of a ticker task running on the
+same event loop. Sync views run in a thread pool, so the ticker keeps
+running and the reloads overlap. Exits with status 1 if the event loop was
+blocked or a rendered view lost its tags.
+
+Run from the repository root:
+    python -m benchmarks.sync_views
+"""
+
+import asyncio
+import re
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from lazyfast import Component, LazyFastRouter, tags
+
+REQUESTS = 10
+BLOCK_TIME = 0.2
+TICK = 0.005
+MAX_LAG = 0.05
+
+
+def build_app() -> FastAPI:
+    router = LazyFastRouter()
+
+    @router.component()
+    class Report(Component):
+        def view(self):
+            time.sleep(BLOCK_TIME)
+            with tags.ul():
+                for i in range(100):
+                    tags.li(f"row {i}")
+
+    @router.page("/")
+    def index():
+        for _ in range(REQUESTS):
+            Report()
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        max_lag = max(max_lag, time.perf_counter() - start - TICK)
+    return max_lag
+
+
+async def main():
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=build_app()), base_url="http://test"
+    )
+    page = (await client.get("/")).text
+    urls = [url.replace("&amp;", "&") for url in re.findall(r'hx-post="([^"]+)"', page)]
+    csrf = re.search(r'value="([0-9a-f]{64})"', page).group(1)
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(ticker(stop))
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(
+        *(client.post(url, data={"csrf": csrf}) for url in urls)
+    )
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    max_lag = await lag
+    await client.aclose()
+
+    complete = sum(response.text.count("<li>") == 100 for response in responses)
+    print(
+        f"{REQUESTS} concurrent sync views blocking {BLOCK_TIME * 1000:.0f} ms each: "
+        f"{elapsed * 1000:.0f} ms total ({REQUESTS * BLOCK_TIME * 1000:.0f} ms if serialized)"
+    )
+    print(f"max event loop lag: {max_lag * 1000:.1f} ms (limit {MAX_LAG * 1000:.0f} ms)")
+    print(f"complete responses: {complete}/{REQUESTS}")
+
+    if max_lag > MAX_LAG or complete != REQUESTS:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
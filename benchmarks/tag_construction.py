@@ -0,0 +1,52 @@
+"""Throughput of tag construction.
+
+Builds a nested tree of elements the way a view does, with a session in the
+render context, and reports how many tags per second are constructed. Only
+construction is measured, the tree is not rendered to html.
+
+Run from the repository root:
+    python -m benchmarks.tag_construction
+"""
+
+import time
+
+from lazyfast import context, tags
+from lazyfast.session import Session
+from lazyfast.state import State
+
+ROWS = 1000
+RUNS = 20
+
+
+def build() -> None:
+    with tags.div(class_="table"):
+        for i in range(ROWS):
+            with tags.div(class_="row"):
+                tags.span(f"row {i}")
+                tags.a("open", href=f"/rows/{i}")
+                tags.p()
+
+
+def measure() -> float:
+    context.clear_root_tags()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    assert len(context.get_root_tags()) == 1
+    return elapsed
+
+
+def main():
+    context.set_session(Session(session_id="benchmark", state=State(), buffer_size=1))
+    count = 1 + ROWS * 4
+
+    measure()  # warm up, imports the element classes
+    best = min(measure() for _ in range(RUNS))
+    print(
+        f"{count} tags in {best * 1000:6.2f} ms, "
+        f"{count / best / 1000:7.1f}k tags/s (best of {RUNS})"
+    )
+
+
+if __name__ == "__main__":
+    main()
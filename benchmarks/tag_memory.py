@@ -0,0 +1,67 @@
+"""Memory and construction time of a large tag tree.
+
+Builds a table with 5,000 rows the way a view does and reports the memory
+held by the tree per node, measured with tracemalloc, and the time it takes
+to construct it.
+
+Run from the repository root:
+    python -m benchmarks.tag_memory
+"""
+
+import time
+import tracemalloc
+
+from lazyfast import context, tags
+from lazyfast.session import Session
+from lazyfast.state import State
+
+ROWS = 5000
+COLUMNS = 5
+RUNS = 5
+
+
+def build() -> tags.Tag:
+    context.clear_root_tags()
+    with tags.table(class_="table", id="report") as root:
+        with tags.tbody():
+            for row in range(ROWS):
+                with tags.tr(dataset={"row": row}):
+                    for col in range(COLUMNS):
+                        tags.td(f"{row}:{col}", class_="cell" if col else None)
+    context.clear_root_tags()
+    return root
+
+
+def count_nodes(tag) -> int:
+    return 1 + sum(count_nodes(child) for child in tag.children)
+
+
+def measure_memory() -> tuple[int, int]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, count_nodes(root)
+
+
+def measure_time() -> float:
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def main():
+    context.set_session(Session(session_id="benchmark", state=State(), buffer_size=1))
+    build()  # warm up, imports the element classes
+
+    size, nodes = measure_memory()
+    elapsed = min(measure_time() for _ in range(RUNS))
+
+    print(f"nodes:        {nodes}")
+    print(f"memory:       {size / 2**20:.1f} MiB, {size / nodes:.0f} bytes per node")
+    print(f"construction: {elapsed * 1000:.1f} ms (best of {RUNS})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Micro-benchmark of tags serialization on a 10k-node tree.
+
+Compares the compiled attribute renderer of `BaseHTML.html()` with the
+previous field-walking implementation and checks that both produce
+byte-identical output.
+
+Run from the repository root:
+    python -m benchmarks.tags_render
+"""
+
+import html as html_utils
+import timeit
+
+from lazyfast import context, tags
+from lazyfast.tags import ATTR_RENAME_MAP, FIELDS_TO_EXCLUDE
+
+ROWS = 1000
+COLUMNS = 9
+REPEAT = 5
+
+
+def legacy_attrs(tag) -> str:
+    def build(key, value, replace_underscore=True):
+        attr_name = ATTR_RENAME_MAP.get(key, key)
+        if replace_underscore:
+            attr_name = attr_name.replace("_", "-")
+        if isinstance(value, bool):
+            return f"{attr_name} "
+        return f'{attr_name}="{value}" '
+
+    attrs = ""
+    for key in tag.__dataclass_fields__:
+        if key in FIELDS_TO_EXCLUDE:
+            continue
+        if value := getattr(tag, key):
+            if key == "dataset":
+                for data_key, data_value in value.items():
+                    attrs += build("data-" + data_key, data_value, False)
+            elif key == "hx":
+                for hx_key, hx_value in value.attrs:
+                    if hx_value:
+                        attrs += build(hx_key, hx_value)
+            else:
+                attrs += build(key, value)
+    return attrs.strip()
+
+
+def legacy_html(tag) -> str:
+    attrs = legacy_attrs(tag)
+    if attrs:
+        attrs = " " + attrs
+
+    if tag._self_closing:
+        return f"<{tag.tag_name}{attrs} />"
+    elif tag.content:
+        if tag.allow_unsafe_html:
+            content = tag.content
+        else:
+            content = html_utils.escape(str(tag.content), quote=True)
+    else:
+        content = "".join([legacy_html(child) for child in tag.children])
+
+    if tag.tag_name == "raw":
+        return content
+    return f"<{tag.tag_name}{attrs}>{content}</{tag.tag_name}>"
+
+
+def build_tree() -> tags.Tag:
+    context.clear_root_tags()
+    context.clear_tag_stack()
+
+    with tags.table(class_="table is-striped", id="report") as root:
+        with tags.tbody():
+            for row in range(ROWS):
+                with tags.tr(dataset={"row": row, "selected": row % 2 == 0}):
+                    for col in range(COLUMNS):
+                        tags.td(
+                            f"<{row}:{col}>",
+                            class_="cell",
+                            colspan=1 if col else None,
+                            hidden=col == COLUMNS - 1,
+                        )
+
+    context.clear_root_tags()
+    return root
+
+
+def count_nodes(tag) -> int:
+    return 1 + sum(count_nodes(child) for child in tag.children)
+
+
+def main():
+    root = build_tree()
+    assert root.html() == legacy_html(root), "compiled renderer output differs"
+
+    nodes = count_nodes(root)
+    legacy = min(timeit.repeat(lambda: legacy_html(root), number=1, repeat=REPEAT))
+    compiled = min(timeit.repeat(root.html, number=1, repeat=REPEAT))
+
+    print(f"nodes:    {nodes}")
+    print(f"legacy:   {legacy * 1000:.1f} ms")
+    print(f"compiled: {compiled * 1000:.1f} ms ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
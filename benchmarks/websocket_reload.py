@@ -0,0 +1,73 @@
+"""Cost of a component reload over HTTP and over the WebSocket transport.
+
+Sends the reloads of a live search component one after another, as typing
+into its input does, and measures the time per reload. Over HTTP every
+reload is a POST request with headers, cookies and form data, resolving the
+session and the router dependencies again. Over the WebSocket they are
+resolved once per connection.
+
+Run from the repository root:
+    python -m benchmarks.websocket_reload
+"""
+
+import re
+import time
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from lazyfast import Component, LazyFastRouter, ReloadRequest, tags
+
+RELOADS = 500
+
+
+def build_app() -> FastAPI:
+    router = LazyFastRouter(websocket_transport=True)
+
+    @router.component()
+    class Search(Component):
+        async def view(self, request: ReloadRequest = Depends()):
+            query = request.inputs.get("query", "")
+            tags.input(name="query", value="")
+            with tags.ul():
+                for i in range(10):
+                    tags.li(f"{query} result {i}")
+
+    @router.page("/")
+    def index():
+        Search()
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def main():
+    client = TestClient(build_app())
+    page = client.get("/").text
+    url = re.search(r'hx-post="([^"]+)"', page).group(1).replace("&amp;", "&")
+    component_id = re.search(r"__cid__=(\w+)", page).group(1)
+    csrf = re.search(r'value="([0-9a-f]{64})"', page).group(1)
+    queries = [f"query {i}" for i in range(RELOADS)]
+
+    start = time.perf_counter()
+    for query in queries:
+        html = client.post(url, data={"csrf": csrf, "query": query}).text
+        assert query in html
+    http_time = (time.perf_counter() - start) / RELOADS
+
+    with client.websocket_connect("/__lazyfast__/ws") as websocket:
+        start = time.perf_counter()
+        for query in queries:
+            websocket.send_json(
+                {"cid": component_id, "inputs": {"csrf": csrf, "query": query}}
+            )
+            assert query in websocket.receive_json()["html"]
+        websocket_time = (time.perf_counter() - start) / RELOADS
+
+    print(f"http POST  {http_time * 1000:6.2f} ms per reload")
+    print(f"websocket  {websocket_time * 1000:6.2f} ms per reload")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,14 @@ from . import tags
 from .state import State as BaseState
 from .component import Component
 from .request import ReloadRequest
+from .executor import offload, set_offload_executor
+from .session import (
+    SessionStorage,
+    SessionBackend,
+    InMemorySessionBackend,
+    KeyValueSessionBackend,
+    InMemoryKeyValueStore,
+)
 
 __all__ = [
     "LazyFastRouter",
@@ -10,4 +18,11 @@ __all__ = [
     "BaseState",
     "Component",
     "ReloadRequest",
+    "offload",
+    "set_offload_executor",
+    "SessionStorage",
+    "SessionBackend",
+    "InMemorySessionBackend",
+    "KeyValueSessionBackend",
+    "InMemoryKeyValueStore",
 ]
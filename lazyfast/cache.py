@@ -1,39 +1,266 @@
+import time
+import asyncio
+import inspect
 import functools
-import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Iterable, Literal
+
 from lazyfast.state import StateField
 from lazyfast import context, tags
-from lazyfast.utils import str_hash
 
 
 class Cache:
-    def __init__(self):
-        self._cache = {}
+    """Rendered html fragments of a session.
+
+    Entries are evicted in least recently used order when the total size of cached
+    fragments exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int | None = 1024 * 1024):
+        # key -> (value, size, expiration time, state fields)
+        self._cache: OrderedDict[
+            Hashable, tuple[str, int, float | None, tuple[str, ...]]
+        ] = OrderedDict()
+        self._field_keys: dict[str, set[Hashable]] = {}
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> str | None:
+        if (entry := self._cache.get(key)) is None:
+            self._misses += 1
+            return None
+
+        value, _, expires_at, _ = entry
+
+        if expires_at is not None and expires_at < time.monotonic():
+            self.delete(key)
+            self._misses += 1
+            return None
+
+        self._cache.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: str,
+        max_age: float | None = None,
+        fields: tuple[str, ...] = (),
+    ):
+        self.delete(key)
+
+        size = len(value.encode())
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+
+        expires_at = None if max_age is None else time.monotonic() + max_age
+        self._cache[key] = (value, size, expires_at, fields)
+        self._size += size
+
+        for field_name in fields:
+            self._field_keys.setdefault(field_name, set()).add(key)
+
+        if self._max_bytes is not None:
+            while self._size > self._max_bytes:
+                self.delete(next(iter(self._cache)))
+
+    def delete(self, key: Hashable) -> None:
+        if (entry := self._cache.pop(key, None)) is None:
+            return
+
+        _, size, _, fields = entry
+        self._size -= size
+
+        for field_name in fields:
+            if keys := self._field_keys.get(field_name):
+                keys.discard(key)
+
+    def invalidate_fields(self, fields: Iterable[str]) -> None:
+        """Delete entries that depend on any of the state fields"""
+        for field_name in fields:
+            for key in self._field_keys.pop(field_name, ()):
+                self.delete(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._field_keys.clear()
+        self._size = 0
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "entries": len(self._cache),
+            "bytes": self._size,
+        }
+
+
+global_cache = Cache(max_bytes=16 * 1024 * 1024)
+"""Fragments shared by all sessions"""
+
+_global_renders: dict[Hashable, asyncio.Future] = {}
+
+
+async def render_shared(
+    key: Hashable, render: Callable[[], Awaitable[str]], max_age: float | None = None
+) -> tuple[str, bool]:
+    """Get a fragment from the global cache, rendering it on a miss.
+
+    Concurrent misses of the same key wait for a single render.
+    Returns the fragment and whether it was rendered by this call.
+    """
+    while (content := global_cache.get(key)) is None and (
+        future := _global_renders.get(key)
+    ):
+        try:
+            return await asyncio.shield(future), False
+        except asyncio.CancelledError:
+            # the render was cancelled with its request, try again
+            if not future.cancelled():
+                raise
+
+    if content is not None:
+        return content, False
+
+    future = asyncio.get_running_loop().create_future()
+    _global_renders[key] = future
+
+    try:
+        content = await render()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as error:
+        future.set_exception(error)
+        future.exception()
+        raise
+    finally:
+        _global_renders.pop(key, None)
 
-    def get(self, key: str) -> str | None:
-        return self._cache.get(key)
-    
-    def set(self, key: str, value: str):
-        self._cache[key] = value
+    global_cache.set(key, content, max_age)
+    future.set_result(content)
+    return content, True
+
+
+def _make_key(func: Callable, args: tuple, kwargs: dict) -> Hashable | None:
+    key = (f"{func.__module__}.{func.__qualname__}", args, tuple(kwargs.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _lookup(
+    func: Callable, args: tuple, kwargs: dict
+) -> tuple[Cache | None, Hashable | None, bool]:
+    """Return the session cache and the key of the call, and whether a cached fragment was rendered"""
+    session = context.get_session()
+    key = _make_key(func, args, kwargs) if session else None
+
+    if key is None:
+        return None, None, False
+
+    if (content := session.cache.get(key)) is not None:
+        tags.raw(content)
+        return session.cache, key, True
+
+    return session.cache, key, False
 
 
 # cache decorator
-def cache(invalidate_on: list[StateField] | None = None, max_age: int | None = None):
+def cache(
+    invalidate_on: list[StateField] | None = None,
+    max_age: int | None = None,
+    scope: Literal["session", "global"] = "session",
+):
+    """Cache html rendered by the decorated function.
+
+    The key is built from the function and its arguments, which must be hashable,
+    otherwise the function is called without caching.
+
+    Args:
+        invalidate_on (list[StateField], optional): State fields whose committed changes delete the entry.
+            Only for the "session" scope.
+        max_age (int, optional): Lifetime of the entry in seconds. Defaults to None (until evicted).
+        scope (Literal["session", "global"], optional): Keep the entry in the session or share it
+            between all sessions. Concurrent misses of a global async function render it only once.
+            Defaults to "session".
+
+    Raises:
+        ValueError: If invalidate_on is used with the "global" scope
+    """
+    if scope == "global" and invalidate_on:
+        raise ValueError("invalidate_on can't be used with the global cache scope")
+
+    fields = tuple(state_field.name for state_field in invalidate_on or ())
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if scope == "global":
+                    if (key := _make_key(func, args, kwargs)) is None:
+                        return await func(*args, **kwargs)
+
+                    result = None
+
+                    async def render() -> str:
+                        nonlocal result
+                        with tags.raw() as fragment:
+                            result = await func(*args, **kwargs)
+                        return fragment.html()
+
+                    content, rendered = await render_shared(key, render, max_age)
+                    if not rendered:
+                        tags.raw(content)
+                    return result
+
+                session_cache, key, hit = _lookup(func, args, kwargs)
+                if hit:
+                    return
+                if session_cache is None:
+                    return await func(*args, **kwargs)
+
+                with tags.raw() as fragment:
+                    result = await func(*args, **kwargs)
+
+                session_cache.set(key, fragment.html(), max_age, fields)
+                return result
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            #context.enable_caching()
+            if scope == "global":
+                if (key := _make_key(func, args, kwargs)) is None:
+                    return func(*args, **kwargs)
+                if (content := global_cache.get(key)) is not None:
+                    tags.raw(content)
+                    return
 
-            cache_key = str_hash(
-                f"{func.__module__}.{func.__qualname__}:{args}:{kwargs}".encode(),
-            )
+                with tags.raw() as fragment:
+                    result = func(*args, **kwargs)
 
-            if session := context.get_session():
-                if content := session.cache.get(cache_key):
-                    tags.raw(content)
-                    return 
+                global_cache.set(key, fragment.html(), max_age)
+                return result
+
+            session_cache, key, hit = _lookup(func, args, kwargs)
+            if hit:
+                return
+            if session_cache is None:
+                return func(*args, **kwargs)
+
+            with tags.raw() as fragment:
+                result = func(*args, **kwargs)
+
+            session_cache.set(key, fragment.html(), max_age, fields)
+            return result
 
-                func(*args, **kwargs)
-            
         return wrapper
 
     return decorator
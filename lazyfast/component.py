@@ -1,3 +1,7 @@
+import contextvars
+import os
+from typing import Any, Callable, ClassVar, Literal
+
 from pydantic import BaseModel
 
 from lazyfast.htmx import HTMX
@@ -12,20 +16,82 @@ SWAPPING_METHODS_MAP = {
     "prepend": "afterbegin",
 }
 
+
+def _render_static(renderer: Callable[[], Any]) -> str:
+    """Render a function in an empty render context, without a session"""
+
+    def render() -> str:
+        renderer()
+        return "".join(tag.html() for tag in context.get_root_tags())
+
+    return contextvars.Context().run(render)
+
+
+class ComponentShell:
+    """Parts of the loader container that are the same for all instances of a component class.
+
+    Built once when the class is registered, an instance only splices in its ids and the
+    url prefix of the session.
+
+    Args:
+        url (str): Url of the component view, without the session prefix
+        loader_class (str): CSS class of the loader container
+        class_ (str | None): Extra CSS class of the container
+        csrf_input_id (str): ID of the CSRF input tag
+        swapping_method (Literal["replace", "append", "prepend"]): How old content is replaced with new content
+        preload_renderer (Callable | None, optional): Function that renders the container content before loading.
+            Defaults to None.
+        cache_preload (bool, optional): Render the preload renderer once, here, and reuse its html.
+            Defaults to False.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        loader_class: str,
+        class_: str | None,
+        csrf_input_id: str,
+        swapping_method: Literal["replace", "append", "prepend"],
+        preload_renderer: Callable[[], Any] | None = None,
+        cache_preload: bool = False,
+    ) -> None:
+        self.url = url
+        self.class_ = loader_class + " " + (class_ or "")
+        self.include_prefix = f"#{csrf_input_id}, #"
+        self.swap = f"{SWAPPING_METHODS_MAP[swapping_method]} transition:true"
+        self.preload_html = (
+            _render_static(preload_renderer)
+            if cache_preload and preload_renderer
+            else None
+        )
+
+    def get_url(self, prefix: str, component_id: str) -> str:
+        # component ids are hex strings, there is nothing to encode
+        return f"{url_join(prefix, self.url)}?__cid__={component_id}"
+
+
 class Component(BaseModel):
-    _container_id = None
-    _url = None
-    _class = None
-    _id_prefix = "cid_"
-    _loader_class = None
-    _preload_renderer = lambda: None
-    _loader_route_prefix = None
-    _csrf_input_id = None
-    _swapping_method = "replace"
+    _component_id = None
+    _last_inputs = None
+
+    # set by router.component() for the whole class, not copied to every instance
+    _container_id: ClassVar[str | None] = None
+    _url: ClassVar[str | None] = None
+    _class: ClassVar[str | None] = None
+    _id_prefix: ClassVar[str] = "cid_"
+    _loader_class: ClassVar[str | None] = None
+    _preload_renderer: ClassVar[Callable | None] = None
+    _loader_route_prefix: ClassVar[str | None] = None
+    _csrf_input_id: ClassVar[str | None] = None
+    _swapping_method: ClassVar[str] = "replace"
+    _batch_loading: ClassVar[bool] = False
+    _prerender: ClassVar[bool] = False
+    _reload_on: ClassVar[tuple[str, ...]] = ()
+    _shell: ClassVar[ComponentShell | None] = None
 
     @property
     def component_id(self) -> str:
-        return str(id(self))
+        return self._component_id or str(id(self))
 
     @property
     def container_id(self) -> str:
@@ -38,37 +104,62 @@ class Component(BaseModel):
         session = context.get_session()
         await session.state.enqueue(self.container_id)
 
+    @property
+    def load_url(self) -> str:
+        return self._container.hx.url
+
     def set_path_params(self, **kwargs):
         self._container.hx.set_path_params(**kwargs)
 
+    def _fallback_loader_html(self) -> str:
+        """Loader container which is swapped out-of-band and loads the component by itself"""
+        container = self._container
+        container.hx.set_trigger(f"load, {self.container_id}")
+        container.dataset = None
+        content = container.content or container._build_content()
+        return f'<div hx-swap-oob="outerHTML" {container._get_attrs()}>{content}</div>'
+
     def model_post_init(self, _):
+        # kept as an attribute, so the id survives session serialization. Not id(self):
+        # addresses of released components are reused, and a stale request must get 410
+        component_id = self._component_id = os.urandom(16).hex()
+
         session = context.get_session()
         session.add_component(self)
-        context.set_session(session)
 
-        component_id = self.component_id
-        container_id = self.container_id
+        shell = self._shell
+        container_id = self._container_id or (self._id_prefix + component_id)
+        prerender = self._prerender or context.is_prerender_enabled()
+        batch_loading = self._batch_loading and not prerender
 
-        if prefix_path := session.prefix_path:
-            prefix = prefix_path
-        else:
-            prefix = "/"
-
-        url = url_join(prefix, self._url, query_params={"__cid__": component_id})
         htmx = HTMX(
-            url=url,
+            url=shell.get_url(session.prefix_path or "/", component_id),
             method="post",
-            include=f"#{self._csrf_input_id}, #{container_id}",
-            trigger=f"load, {container_id}",
-            swap=f"{SWAPPING_METHODS_MAP[self._swapping_method]} transition:true",
+            include=shell.include_prefix + container_id,
+            trigger=container_id if prerender or batch_loading else f"load, {container_id}",
+            swap=shell.swap,
+            # a newer reload aborts the request in flight
+            sync="this:replace",
         )
 
-        with tags.div(
-            class_=self._loader_class + " " + (self._class or ""),
+        container = tags.div(
+            class_=shell.class_,
             hx=htmx,
             id=container_id,
-        ) as container:
-            if self._preload_renderer:
+            dataset={"batch-cid": component_id} if batch_loading else None,
+        )
+
+        if shell.preload_html:
+            container.content = shell.preload_html
+            container.allow_unsafe_html = True
+        elif self._preload_renderer:
+            with container:
                 self._preload_renderer()
 
         self._container = container
+
+        if prerender:
+            context.add_prerender_component(self)
+
+        if self._reload_on and session.state:
+            session.state.subscribe(container_id, self._reload_on)
@@ -1,59 +1,154 @@
-from typing import Any
-from collections import deque
-from asgiref.local import Local
+from typing import Any, Callable
+from contextvars import ContextVar
+
+
+class RenderContext:
+    """Per-render state: the stack of open tags, the root tags and the session.
+
+    Stored in a single ContextVar, so asyncio tasks and threads started with a copy of
+    the context (`asyncio.create_task`, `run_in_threadpool`) see the render they belong to.
+    Lists are shared with such copies, while the setters below replace the object, so
+    assigning a session or clearing the root tags in a child task does not leak into
+    the parent.
+    """
+
+    __slots__ = (
+        "tag_stack",
+        "root_tags",
+        "root_tag_listener",
+        "session",
+        "request",
+        "reload_request",
+        "prerender_components",
+        "prerender",
+        "caching",
+    )
+
+    def __init__(self) -> None:
+        self.tag_stack: list[Any] = []
+        self.root_tags: list[Any] = []
+        self.root_tag_listener: Callable[[Any], None] | None = None
+        self.session: Any = None
+        self.request: tuple[Any, Any, Any] | None = None
+        self.reload_request: Any = None
+        self.prerender_components: list[Any] = []
+        self.prerender: bool = False
+        self.caching: bool = False
+
+    def add_root_tag(self, tag: Any) -> None:
+        self.root_tags.append(tag)
+        if self.root_tag_listener:
+            self.root_tag_listener(tag)
+
+    def copy(self) -> "RenderContext":
+        ctx = RenderContext.__new__(RenderContext)
+        for name in RenderContext.__slots__:
+            setattr(ctx, name, getattr(self, name))
+        return ctx
+
+
+_render_context: ContextVar[RenderContext | None] = ContextVar(
+    "lazyfast_render_context", default=None
+)
+
+
+def get_render_context() -> RenderContext:
+    if (ctx := _render_context.get()) is None:
+        ctx = RenderContext()
+        _render_context.set(ctx)
+    return ctx
+
+
+def _update_render_context(**values: Any) -> None:
+    ctx = get_render_context().copy()
+    for name, value in values.items():
+        setattr(ctx, name, value)
+    _render_context.set(ctx)
 
-local_data = Local()
 
 # Работа с tag_stack
 def get_all_tags_from_stack() -> list[Any]:
-    return getattr(local_data, "tag_stack", [])
+    return get_render_context().tag_stack
 
 def append_tag_to_stack(elm: Any) -> None:
-    if hasattr(local_data, "tag_stack"):
-        local_data.tag_stack.append(elm)
-    else:
-        local_data.tag_stack = deque([elm])
+    get_render_context().tag_stack.append(elm)
 
 def get_last_tag_from_stack() -> Any | None:
-    if tag_stack := getattr(local_data, "tag_stack", None):
+    if tag_stack := get_render_context().tag_stack:
         return tag_stack[-1]
     return None
 
 def update_last_tag_in_stack(elm: Any) -> None:
-    if hasattr(local_data, "tag_stack"):
-        local_data.tag_stack[-1] = elm
+    if tag_stack := get_render_context().tag_stack:
+        tag_stack[-1] = elm
 
 def pop_last_tag_from_stack() -> None:
-    if hasattr(local_data, "tag_stack"):
-        local_data.tag_stack.pop()
+    if tag_stack := get_render_context().tag_stack:
+        tag_stack.pop()
 
 def clear_tag_stack() -> None:
-    local_data.tag_stack = deque()
+    _update_render_context(tag_stack=[])
 
 
 # Работа с root_tags
 def get_root_tags() -> list[Any]:
-    return getattr(local_data, "root_tags", [])
+    return get_render_context().root_tags
 
 def clear_root_tags() -> None:
-    local_data.root_tags = []
+    _update_render_context(root_tags=[])
 
 def add_root_tag(tag: Any) -> None:
-    if not hasattr(local_data, "root_tags"):
-        local_data.root_tags = []
-    local_data.root_tags.append(tag)
+    get_render_context().add_root_tag(tag)
+
+def set_root_tag_listener(listener: Callable[[Any], None] | None) -> None:
+    _update_render_context(root_tag_listener=listener)
 
 
 # Работа с session
 def set_session(session: dict[str, Any]) -> None:
-    local_data.session = session
+    _update_render_context(session=session)
 
 def get_session() -> dict[str, Any] | None:
-    return getattr(local_data, "session", None)
+    return get_render_context().session
+
+
+# Работа с request
+def set_request(request: Any, response: Any, background_tasks: Any) -> None:
+    _update_render_context(request=(request, response, background_tasks))
+
+def get_request() -> tuple[Any, Any, Any] | None:
+    return get_render_context().request
+
+
+# Работа с reload_request
+def set_reload_request(reload_request: Any) -> None:
+    # set in place: ReloadRequest is a sync dependency, solved in a worker thread
+    # whose context copy shares this object with the request task
+    get_render_context().reload_request = reload_request
+
+def get_reload_request() -> Any:
+    return get_render_context().reload_request
+
+
+# Работа с prerender
+def get_prerender_components() -> list[Any]:
+    return get_render_context().prerender_components
+
+def add_prerender_component(component: Any) -> None:
+    get_render_context().prerender_components.append(component)
+
+def clear_prerender_components() -> None:
+    _update_render_context(prerender_components=[])
+
+def set_prerender_enabled(enabled: bool) -> None:
+    _update_render_context(prerender=enabled)
+
+def is_prerender_enabled() -> bool:
+    return get_render_context().prerender
 
 
 def enable_caching() -> None:
-    local_data.caching = True
-    
+    _update_render_context(caching=True)
+
 def is_caching_enabled() -> bool:
-    return getattr(local_data, "caching", False)
\ No newline at end of file
+    return get_render_context().caching
@@ -0,0 +1,523 @@
+from typing import Any, Literal
+
+from lazyfast import context
+from lazyfast.tags import RELOAD_SCRIPT, THROTTELED_RELOAD_SCRIPT, Tag, element
+
+
+@element
+class div(Tag):
+    pass
+
+
+@element
+class span(Tag):
+    pass
+
+
+@element
+class p(Tag):
+    pass
+
+
+@element
+class b(Tag):
+    pass
+
+
+@element
+class ul(Tag):
+    pass
+
+
+@element
+class ol(Tag):
+    reversed_: bool | None = None
+    start: int | None = None
+    type_: str | None = None
+
+
+@element
+class li(Tag):
+    value: int | None = None
+
+
+@element
+class h1(Tag):
+    pass
+
+
+@element
+class h2(Tag):
+    pass
+
+
+@element
+class h3(Tag):
+    pass
+
+
+@element
+class h4(Tag):
+    pass
+
+
+@element
+class h5(Tag):
+    pass
+
+
+@element
+class h6(Tag):
+    pass
+
+
+_referrerpolicy = Literal[
+    "no-referrer",
+    "no-referrer-when-downgrade",
+    "same-origin",
+    "origin",
+    "origin-when-cross-origin",
+    "unsafe-url",
+]
+
+
+@element
+class a(Tag):
+    href: str | None = None
+    rel: str | None = None
+    type_: str | None = None
+    crossorigin: Literal["anonymous", "use-credentials"] | None = None
+    integrity: str | None = None
+    referrerpolicy: _referrerpolicy | None = None
+    download: bool | None = None
+
+
+@element
+class caption(Tag):
+    pass
+
+
+@element
+class colgroup(Tag):
+    pass
+
+
+@element
+class col(Tag):
+    pass
+
+
+@element
+class table(Tag):
+    pass
+
+
+@element
+class thead(Tag):
+    pass
+
+
+@element
+class tbody(Tag):
+    pass
+
+
+@element
+class tfoot(Tag):
+    pass
+
+
+@element
+class tr(Tag):
+    pass
+
+
+@element
+class th(Tag):
+    abbr: str | None = None
+    colspan: int | None = None
+    rowspan: int | None = None
+    headers: str | None = None
+    scope: Literal["col", "colgroup", "row", "rowgroup"] | None = None
+
+
+@element
+class td(Tag):
+    colspan: int | None = None
+    rowspan: int | None = None
+    headers: str | None = None
+
+
+_referrerpolicy = Literal[
+    "no-referrer",
+    "no-referrer-when-downgrade",
+    "same-origin",
+    "origin",
+    "origin-when-cross-origin",
+    "unsafe-url",
+]
+
+
+@element
+class script(Tag):
+    src: str | None = None
+    type: str | None = None
+    async_: bool | None = None
+    defer: bool | None = None
+    integrity: str | None = None
+    nonce: str | None = None
+    referrerpolicy: _referrerpolicy | None = None  # type: ignore
+    crossorigin: Literal["anonymous", "use-credentials"] | None = None
+    integrity: str | None = None
+    referrerpolicy: _referrerpolicy | None = None  # type: ignore
+
+    allow_unsafe_html: bool | None = True
+
+
+@element
+class style(Tag):
+    src: str | None = None
+    type: str | None = None
+
+    allow_unsafe_html: bool | None = True
+
+
+@element
+class link(Tag):
+    href: str | None = None
+    rel: str | None = None
+    type: str | None = None
+    crossorigin: Literal["anonymous", "use-credentials"] | None = None
+    integrity: str | None = None
+    referrerpolicy: _referrerpolicy | None = None  # type: ignore
+
+
+@element
+class meta(Tag):
+    _self_closing = True
+
+    name: str | None = None
+    content_: str | None = None
+    charset: str | None = None
+    http_equiv: str | None = None
+    scheme: str | None = None
+
+
+@element
+class html(Tag):
+    lang: str | None = None
+
+
+@element
+class body(Tag):
+    lang: str | None = None
+
+
+@element
+class head(Tag):
+    pass
+
+
+@element
+class header(Tag):
+    pass
+
+
+@element
+class footer(Tag):
+    pass
+
+
+@element
+class title(Tag):
+    pass
+
+
+@element
+class nav(Tag):
+    pass
+
+
+@element
+class section(Tag):
+    pass
+
+
+_enctype = Literal[
+    "application/x-www-form-urlencoded", "multipart/form-data", "text/plain"
+]
+
+
+@element
+class form(Tag):
+    pass
+    # accept_charset: str | None = None
+    # action: str | None = None
+    # # TODO: autocomplete attribute
+    # enctype: _enctype | None = None
+    # method: Literal["get", "post"] | None = None
+    # name: str | None = None
+    # # TODO: novalidate attribute
+    # target: Literal["_self", "_blank", "_parent", "_top"] | None = None
+
+    # onreset: Callable | None = None
+    # onselect: Callable | None = None
+    onsubmit: str | None = "preventFormSubmission(event)"
+
+
+_input_type = Literal[
+    "button",
+    "checkbox",
+    "color",
+    "date",
+    "datetime-local",
+    "email",
+    "file",
+    "hidden",
+    "image",
+    "month",
+    "number",
+    "password",
+    "radio",
+    "range",
+    "reset",
+    "search",
+    "submit",
+    "tel",
+    "text",
+    "time",
+    "url",
+    "week",
+]
+
+
+@element
+class input(Tag):
+    _self_closing = True
+
+    type_: _input_type | None = None
+    accept: str | None = None
+    checked: bool | None = None
+    disabled: bool | None = None
+    maxlength: int | None = None
+    name: str | None = None
+    readonly: bool | None = None
+    required: bool | None = None
+    value: str | None = None
+    placeholder: str | None = None
+    list: str | None = None
+    multiple: bool | None = None
+    min: str | None = None
+    max: str | None = None
+    step: str | None = None
+
+    onchange: str | None = THROTTELED_RELOAD_SCRIPT
+    oninput: str | None = None
+
+    def __post_init__(self):
+        if self.value and not self.name:
+            raise ValueError("Name attribute is required if value is set")
+
+        inputs = context.get_reload_request().data
+
+        self.value = inputs.get(self.name, self.value)
+
+        if self.type_ == "checkbox":
+            self.checked = bool(self.value)
+
+        super(input, self).__post_init__()
+
+
+@element
+class button(Tag):
+    disabled: bool | None = None
+    name: str | None = None
+    type_: Literal["submit", "reset", "button"] | None = None
+    value: str | None = None
+    onclick: str | None = RELOAD_SCRIPT
+
+    def __post_init__(self):
+        if self.popovertarget:
+            self.onclick = None
+        super(button, self).__post_init__()
+
+
+@element
+class label(Tag):
+    for_: str | None = None
+
+
+@element
+class select(Tag):
+    autofocus: bool | None = None
+    disabled: bool | None = None
+    multiple: bool | None = None
+    name: str | None = None
+    required: bool | None = None
+    size: int | None = None
+
+    onchange: str | None = RELOAD_SCRIPT
+    oninput: str | None = None
+
+    def __post_init__(self):
+        if self.value and not self.name:
+            raise ValueError("Name attribute is required if value is set")
+        super(select, self).__post_init__()
+
+    @property
+    def value(self) -> Any:
+        if not self.name:
+            raise ValueError("Name attribute is required for getting value")
+        inputs = context.get_reload_request().data
+        return inputs.get(self.name)
+
+
+@element
+class textarea(Tag):
+    name: str | None = None
+    placeholder: str | None = None
+    required: bool | None = None
+    autofocus: bool | None = None
+    cols: int | None = None
+    rows: int | None = None
+    disabled: bool | None = None
+    maxlength: int | None = None
+    readonly: bool | None = None
+    dirname: str | None = None
+    form: str | None = None
+    wrap: Literal["hard", "soft"] | None = None
+    oninput: str | None = RELOAD_SCRIPT
+
+    def __post_init__(self):
+        inputs = context.get_reload_request().data
+        self.content = inputs.get(self.name, self.content)
+        super(textarea, self).__post_init__()
+
+
+@element
+class option(Tag):
+    disabled: bool | None = None
+    label: str | None = None
+    selected: bool | None = None
+    value: str | None = None
+
+
+@element
+class optgroup(Tag):
+    disabled: bool | None = None
+    label: str | None = None
+
+
+@element
+class i(Tag):
+    pass
+
+
+@element
+class article(Tag):
+    pass
+
+
+@element
+class img(Tag):
+    src: str | None = None
+    alt: str | None = None
+    width: int | None = None
+    height: int | None = None
+    crossorigin: Literal["anonymous", "use-credentials"] | None = None
+    loading: Literal["eager", "lazy"] | None = None
+
+
+@element
+class data(Tag):
+    value: str | None = None
+
+
+@element
+class datalist(Tag):
+    pass
+
+
+@element
+class dialog(Tag):
+    open: bool | None = None
+
+
+@element
+class dl(Tag):
+    pass
+
+
+@element
+class dt(Tag):
+    pass
+
+
+@element
+class em(Tag):
+    pass
+
+
+@element
+class blockquote(Tag):
+    cite: str | None = None
+
+
+@element
+class strong(Tag):
+    pass
+
+
+@element
+class canvas(Tag):
+    width: int | None = None
+    height: int | None = None
+
+
+@element
+class small(Tag):
+    pass
+
+
+@element
+class br(Tag):
+    pass
+
+
+@element
+class aside(Tag):
+    pass
+
+
+@element
+class details(Tag):
+    open: bool | None = None
+
+
+@element
+class embed(Tag):
+    src: str | None = None
+    type: str | None = None
+    width: int | None = None
+    height: int | None = None
+
+
+@element
+class progress(Tag):
+    max: int | None = None
+    value: int | None = None
+
+
+@element
+class hr(Tag):
+    pass
+
+
+@element
+class pre(Tag):
+    pass
+
+
+@element
+class code(Tag):
+    pass
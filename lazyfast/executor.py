@@ -0,0 +1,97 @@
+import asyncio
+import contextvars
+from concurrent.futures import Executor
+from typing import Any, Callable, ParamSpec, TypeVar
+
+from lazyfast import context, tags
+
+__all__ = ["offload", "set_offload_executor"]
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_executor: Executor | None = None
+
+
+def set_offload_executor(executor: Executor) -> None:
+    """Run `offload` calls in this executor instead of the default process pool"""
+    global _executor
+    _executor = executor
+
+
+def _get_executor() -> Executor:
+    global _executor
+
+    if _executor is None:
+        # imported on the first use, multiprocessing is slow to import
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # forking a process that runs threads and an event loop is unsafe
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        _executor = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context(start_method)
+        )
+    return _executor
+
+
+def _run_offloaded(
+    func: Callable, args: tuple, kwargs: dict[str, Any]
+) -> tuple[Any, str]:
+    """Call the function in an empty render context and serialize the tags it created"""
+
+    def run() -> tuple[Any, str]:
+        result = func(*args, **kwargs)
+        return result, "".join(tag.html() for tag in context.get_root_tags())
+
+    return contextvars.Context().run(run)
+
+
+async def offload(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """Run a CPU-heavy function in a process pool, without blocking the event loop and the GIL.
+
+    The function may return data, create tags, or both. Tags it creates are rendered in the worker
+    process, and their html is inserted into the current tag tree as `raw`. The function doesn't
+    have access to the session, so tags that read the request inputs (`input`, `select`,
+    `textarea`) or nested components can't be used in it.
+
+    The function, its arguments and its result are pickled, so the function must be defined
+    at the module level. Use `set_offload_executor` to change the pool.
+
+    Args:
+        func (Callable): Module-level function to run
+        *args: Positional arguments of the function
+        **kwargs: Keyword arguments of the function
+
+    Returns:
+        Any: The return value of the function
+
+    Raises:
+        TypeError: If the function is a lambda or is defined inside another function
+
+    Example:
+        >>> def render_markdown(text: str):
+        ...     tags.raw(markdown.markdown(text))
+        >>> async def view(self):
+        ...     with tags.div(class_="message"):
+        ...         await offload(render_markdown, self.text)
+    """
+    if "<" in getattr(func, "__qualname__", ""):
+        raise TypeError(
+            f"{func.__qualname__} can't be offloaded, it must be a module-level function"
+        )
+
+    loop = asyncio.get_running_loop()
+    result, html = await loop.run_in_executor(
+        _get_executor(), _run_offloaded, func, args, kwargs
+    )
+
+    if html:
+        tags.raw(html)
+
+    return result
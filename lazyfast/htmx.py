@@ -29,6 +29,7 @@ class HTMX:
         vals: dict[str, Any] | str | None = None,
         include: str | None = None,
         headers: dict[str, str] | None = None,
+        sync: str | None = None,
     ) -> None:
         self._url = url
         self._method = method
@@ -39,10 +40,18 @@ class HTMX:
         self._vals = vals
         self._include = include
         self._headers = headers
+        self._sync = sync
 
         self._current_component = None
         self._current_parent_element = None
 
+    @property
+    def url(self) -> str | None:
+        return self._url
+
+    def set_trigger(self, trigger: str | None) -> None:
+        self._trigger = trigger
+
     def set_path_params(self, **kwargs):
         self._url = self._url.format(**kwargs)
 
@@ -53,6 +62,7 @@ class HTMX:
             ("hx-include", self._include),
             ("hx-trigger", self._trigger),
             ("hx-swap", self._swap),
+            ("hx-sync", self._sync),
             ("hx-select", self._select),
             (
                 "hx-vals",
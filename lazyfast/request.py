@@ -2,6 +2,8 @@ import warnings
 from typing import Generic, TypeVar
 from fastapi import Depends, HTTPException, Request
 
+from lazyfast import context
+
 T = TypeVar("T")
 
 
@@ -31,7 +33,7 @@ class ReloadRequest(Generic[T]):
             del inputs["__evt__"]
         self._inputs = inputs
 
-        request.state.session.set_reload_request(self)
+        context.set_reload_request(self)
 
     @property
     def method(self) -> str:
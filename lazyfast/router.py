@@ -1,8 +1,15 @@
 import os
+import re
+import html as html_utils
 import inspect
+import json
 import asyncio
+import contextvars
+from concurrent.futures import Executor
+from contextlib import AsyncExitStack
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
     Literal,
     ParamSpec,
@@ -11,15 +18,38 @@ from typing import (
     TypeVar,
 )
 from functools import wraps
-
-from fastapi import Depends, APIRouter, Request, Response, params
+from urllib.parse import urlsplit
+
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    APIRouter,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    params,
+)
+from fastapi.dependencies.models import Dependant
+from fastapi.exceptions import RequestValidationError
+from fastapi.dependencies.utils import (
+    get_dependant,
+    get_parameterless_sub_dependant,
+    solve_dependencies,
+)
 from fastapi.responses import HTMLResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import compile_path
 
 from lazyfast import context, tags
-from lazyfast.component import Component
+from lazyfast.cache import render_shared
+from lazyfast.component import SWAPPING_METHODS_MAP, Component, ComponentShell
 from lazyfast.state import State, StateField
-from lazyfast.session import ReloadRequest, Session, SessionStorage
-from lazyfast.utils import str_hash, url_join, extract_pattern
+from lazyfast.request import _load_form_data
+from lazyfast.session import ReloadRequest, Session, SessionBackend, SessionStorage
+from lazyfast.static import StaticAsset, read_vendored_htmx
+from lazyfast.utils import check_library_version, str_hash, url_join, extract_pattern
 
 
 __all__ = ["LazyFastRouter"]
@@ -46,9 +76,19 @@ class LazyFastRouter(APIRouter):
         loader_class: str = "__componentLoader__",
         loader_route_prefix: str = "/__lazyfast__",
         sse_endpoint_dependencies: Sequence[params.Depends] | None = None,
-        sse_tick_interval: int = 0.5,
+        sse_tick_interval: float = 0,
         sse_buffer_size: int = 10,
+        sse_buffer_max_age: float | None = None,
         csrf_input_id: str = "csrf",
+        batch_loading: bool = False,
+        session_backend: SessionBackend | None = None,
+        session_max_components: int | None = None,
+        session_cache_max_bytes: int | None = 1024 * 1024,
+        check_version: bool = False,
+        serve_static: bool = False,
+        sse_push_html: bool = False,
+        websocket_transport: bool = False,
+        sync_view_executor: Executor | None = None,
         **fastapi_router_kwargs,
     ):
         """
@@ -67,10 +107,43 @@ class LazyFastRouter(APIRouter):
             loader_class (str, optional): CSS class for the component HTMX loader div. Defaults to "__componentLoader__".
             loader_route_prefix (str, optional): Prefix for the loader request route. Defaults to "/__lazyfast__".
             sse_endpoint_dependencies (Sequence[params.Depends], optional): Dependencies for the SSE endpoint. Defaults to None.
-            sse_tick_interval (int, optional): Interval in seconds for the SSE event loop tick. Defaults to .5.
+            sse_tick_interval (float, optional): Minimum interval in seconds between SSE messages. Defaults to 0.
+                All component reloads that are pending when a message is sent are delivered in it, deduplicated.
             sse_buffer_size (int, optional): Maximum size of the SSE buffer. Defaults to 10.
                 The buffer is needed to send events that were not received due to a connection break.
+                Events are numbered, and a reconnecting client gets the events after the last one it received.
+            sse_buffer_max_age (float | None, optional): Events older than this many seconds are not sent
+                to a reconnecting client. Defaults to None (kept until pushed out of the buffer).
             csrf_input_id (str, optional): ID of the CSRF input tag. Defaults to "csrf".
+            batch_loading (bool, optional): Load all components that appear on the page at once
+                in a single request instead of one request per component. Defaults to False.
+            session_backend (SessionBackend, optional): Storage of sessions, shared by all routers.
+                Use `KeyValueSessionBackend` to share sessions between worker processes.
+                Defaults to None, which keeps the current backend (in-process memory by default).
+            session_max_components (int, optional): Maximum number of component instances kept by a session.
+                The least recently used components are released above it, their requests get a 410 response
+                and the page is loaded again. Keep it well above the components of a page times the open tabs
+                of a session. Defaults to None, unbounded.
+            session_cache_max_bytes (int, optional): Size budget of the `cache` decorator fragments
+                kept by a session. Defaults to 1 MiB. None means unbounded.
+            check_version (bool, optional): Check for a newer LazyFast release on PyPI in a background thread
+                and print a notice if there is one. Defaults to False.
+            serve_static (bool, optional): Serve the LazyFast script together with a vendored htmx as one file
+                from a content-hashed URL under loader_route_prefix, instead of inlining the script into every
+                page and loading htmx from htmx_cdn. The file is cached by browsers as immutable and sent
+                precompressed. Defaults to False.
+            sse_push_html (bool, optional): Render components reloaded by state changes on the server and send
+                their html in the SSE message, instead of sending their ids for the client to request them.
+                A component is rendered with the inputs of its last reload request, and the client keeps the
+                values the user typed since. Defaults to False.
+            websocket_transport (bool, optional): Send component reloads and state updates over one WebSocket
+                connection per page instead of a request per reload and an SSE stream. The session and
+                the router dependencies are resolved once per connection. Reloads that can't be handled over
+                the connection, and browsers that can't connect, use the HTTP requests. Defaults to False.
+            sync_view_executor (Executor, optional): Executor that runs the views and page functions which are
+                not async, so a blocking call in them doesn't stall the event loop. They run with the render
+                context of their request. Defaults to None, which uses the Starlette thread pool, like sync
+                FastAPI endpoints.
 
         Raises:
             TypeError: Raised if state_schema is not a subclass of State.
@@ -88,12 +161,37 @@ class LazyFastRouter(APIRouter):
         self._session_delete_timeout = session_delete_timeout
         self._sse_tick_interval = sse_tick_interval
         self._sse_buffer_size = sse_buffer_size
+        self._sse_buffer_max_age = sse_buffer_max_age
+        self._sse_push_html = sse_push_html
+        self._websocket_transport = websocket_transport
+        self._sync_view_executor = sync_view_executor
         self._csrf_input_id = csrf_input_id
+        self._batch_loading = batch_loading
+        self._session_max_components = session_max_components
+        self._session_cache_max_bytes = session_cache_max_bytes
+
+        if session_backend:
+            SessionStorage.set_backend(session_backend)
+        if check_version:
+            check_library_version()
+        self._component_targets: dict[
+            type, tuple[Dependant, re.Pattern, dict, Callable]
+        ] = {}
+        # (session id, component id) -> render task of the latest request
+        self._inflight_renders: dict[tuple[str, str], asyncio.Task] = {}
+        self._superseded_renders: set[asyncio.Task] = set()
+        self._render_stats = {"renders": 0, "superseded": 0, "cancelled": 0}
 
         self._js_script = JS_SCRIPT_TEMPLATE.replace(
             "__componentLoader__", loader_class
         )
+        self._js_asset = (
+            StaticAsset("lazyfast", f"{read_vendored_htmx()}\n{self._js_script}")
+            if serve_static
+            else None
+        )
 
+        self._router_dependencies = list(fastapi_router_kwargs.get("dependencies") or [])
         lazy_fast_deps = [Depends(self._load_session), Depends(ReloadRequest)]
 
         if "dependencies" in fastapi_router_kwargs:
@@ -111,23 +209,80 @@ class LazyFastRouter(APIRouter):
 
         self._state_schema = state_schema
         self._register_sse_endpoint(sse_endpoint_dependencies)
+
+        if self._js_asset:
+            self._register_static_endpoint(self._js_asset)
+
+        if websocket_transport:
+            self._register_websocket_endpoint()
+
+        if batch_loading:
+            self._register_batch_endpoint()
+
         self._active_session_cleanup_tasks: dict[str, asyncio.Task] = {}
         self._active_session_cleanup_tasks_lock = asyncio.Lock()
 
-    async def _load_session(self, request: Request, response: Response) -> Session:
+    def get_render_stats(self) -> dict[str, int]:
+        """Counters of component endpoint renders.
+
+        `superseded` counts renders whose response was replaced by a newer request for
+        the same component, `cancelled` counts those of them stopped before they finished.
+        """
+        return dict(self._render_stats)
+
+    async def _render_latest(
+        self, key: tuple[str, str], render: Callable[[], Any], cancel: bool
+    ) -> str | None:
+        """Render a component request, superseding the render in flight for the same component.
+
+        Returns None if a newer request for the component arrived before the render finished.
+        """
+        if previous := self._inflight_renders.get(key):
+            self._superseded_renders.add(previous)
+            if cancel:
+                previous.cancel()
+
+        task = asyncio.ensure_future(render())
+        self._inflight_renders[key] = task
+        self._render_stats["renders"] += 1
+
+        try:
+            html = await task
+        except asyncio.CancelledError:
+            task.cancel()
+            if (
+                asyncio.current_task().cancelling()
+                or task not in self._superseded_renders
+            ):
+                raise
+            self._render_stats["cancelled"] += 1
+            return None
+        finally:
+            if self._inflight_renders.get(key) is task:
+                del self._inflight_renders[key]
+            if superseded := task in self._superseded_renders:
+                self._superseded_renders.discard(task)
+                self._render_stats["superseded"] += 1
+
+        return None if superseded else html
+
+    async def _load_session(
+        self, request: Request, response: Response, background_tasks: BackgroundTasks
+    ) -> Session:
         session_id = request.cookies.get(self._session_cookie_key)
         state = self._state_schema() if self._state_schema else None
         session = None
 
         if session_id:
             session = await SessionStorage.get_session(session_id)
-            if not session:
-                session = await SessionStorage.create_session(
-                    state, buffer_size=self._sse_buffer_size
-                )
-        else:
+
+        if not session:
             session = await SessionStorage.create_session(
-                state, buffer_size=self._sse_buffer_size
+                state,
+                buffer_size=self._sse_buffer_size,
+                buffer_max_age=self._sse_buffer_max_age,
+                max_components=self._session_max_components,
+                cache_max_bytes=self._session_cache_max_bytes,
             )
 
         session.set_prefix_path(
@@ -136,48 +291,245 @@ class LazyFastRouter(APIRouter):
 
         request.state.session = session
         context.set_session(session)
+        context.set_request(request, response, background_tasks)
 
         if not session_id or session_id != session.id:
-            response.set_cookie(
-                key=self._session_cookie_key,
-                value=session.id,
-                httponly=True,
-                max_age=self._session_cookie_max_age,
-            )
+            self._set_session_cookie(response, session)
 
         return session
 
+    def _set_session_cookie(self, response: Response, session: Session) -> None:
+        response.set_cookie(
+            key=self._session_cookie_key,
+            value=session.id,
+            httponly=True,
+            max_age=self._session_cookie_max_age,
+        )
+
+    async def _run_sync_view(self, render_view: Callable[[], Any]) -> Any:
+        """Run a sync view in a worker thread.
+
+        The thread gets a copy of the context, which shares the render context of the request,
+        so the tags created by the view are collected as usual.
+        """
+        run = contextvars.copy_context().run
+
+        if self._sync_view_executor:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._sync_view_executor, run, render_view)
+        return await run_in_threadpool(run, render_view)
+
+    async def _stream_root_tags(
+        self,
+        render_view: Callable[[], Any],
+        is_async: bool,
+        template_renderer: Callable | None = None,
+    ) -> AsyncIterator[str]:
+        context.clear_tag_stack()
+        context.clear_root_tags()
+        root_tags = context.get_root_tags()
+        flushed = 0
+
+        def flush(keep_last: bool):
+            nonlocal flushed
+            # a root tag is closed as soon as the next root sibling is created
+            while flushed < len(root_tags) - (1 if keep_last else 0):
+                for chunk in root_tags[flushed].iter_html():
+                    yield chunk
+                flushed += 1
+
+        try:
+            if template_renderer:
+                template_renderer(context.get_session())
+
+            for chunk in flush(keep_last=False):
+                yield chunk
+
+            if is_async:
+                root_tag_added = asyncio.Event()
+                context.set_root_tag_listener(lambda _: root_tag_added.set())
+                view_task = asyncio.ensure_future(render_view())
+
+                while not view_task.done():
+                    waiter = asyncio.ensure_future(root_tag_added.wait())
+                    await asyncio.wait(
+                        {view_task, waiter}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    waiter.cancel()
+                    root_tag_added.clear()
+
+                    # prerendered components are rendered after the view is done
+                    if not context.get_prerender_components():
+                        for chunk in flush(keep_last=True):
+                            yield chunk
+
+                view_task.result()
+            else:
+                await self._run_sync_view(render_view)
+
+            await self._prerender_components()
+
+            for chunk in flush(keep_last=False):
+                yield chunk
+
+            await SessionStorage.save_session(context.get_session())
+
+        finally:
+            context.set_root_tag_listener(None)
+            context.clear_root_tags()
+
+    def _register_static_endpoint(self, asset: StaticAsset):
+        async def static_endpoint(request: Request) -> Response:
+            return asset.response(request)
+
+        # a plain route, assets don't need the session dependencies of the router
+        self.add_route(
+            self.prefix + url_join(self._loader_route_prefix, "static", asset.filename),
+            static_endpoint,
+            methods=["GET"],
+            include_in_schema=False,
+        )
+
+    @staticmethod
+    def _parse_event_id(event_id: str | None) -> int | None:
+        """Sequence number of the last event a client received, from `Last-Event-ID` or the query"""
+        try:
+            return int(event_id) if event_id else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _format_sse_message(component_ids: list[str], event_id: int | None = None) -> str:
+        message = "".join(f"data: {component_id}\n" for component_id in component_ids)
+        return (f"id: {event_id}\n" if event_id is not None else "") + message + "\n"
+
+    @staticmethod
+    def _format_sse_html_message(
+        container_id: str, html: str, event_id: int | None = None
+    ) -> str:
+        # SSE splits data on any line break, the client joins the lines with "\n"
+        html = html.replace("\r\n", "\n").replace("\r", "\n")
+        lines = [container_id, *html.split("\n")]
+        return (
+            "event: html\n"
+            + (f"id: {event_id}\n" if event_id is not None else "")
+            + "".join(f"data: {line}\n" for line in lines)
+            + "\n"
+        )
+
+    async def _render_updated_components(
+        self, request: Request, session: Session, container_ids: list[str]
+    ) -> tuple[list[tuple[str, str]], list[str]]:
+        """Render components reloaded by state changes.
+
+        Returns the container ids with the rendered html, and the ids of components
+        that can't be rendered here, the client reloads them by itself.
+        """
+        rendered = []
+        reload_ids = []
+        response = Response()
+        background_tasks = BackgroundTasks()
+
+        async with AsyncExitStack() as stack:
+            for container_id in container_ids:
+                html = None
+                if component := session.find_component(container_id):
+                    html = await self._render_component_view(
+                        component,
+                        request,
+                        response,
+                        background_tasks,
+                        stack,
+                        inputs={
+                            **(component._last_inputs or {}),
+                            "csrf": session.csrf_token,
+                            "__tid__": container_id,
+                        },
+                    )
+
+                if html is None:
+                    reload_ids.append(container_id)
+                else:
+                    rendered.append((container_id, html))
+
+        await background_tasks()
+        await SessionStorage.save_session(session)
+        return rendered, reload_ids
+
+    async def _render_sse_messages(
+        self,
+        request: Request,
+        session: Session,
+        container_ids: list[str],
+        event_id: int | None = None,
+    ) -> str:
+        rendered, reload_ids = await self._render_updated_components(
+            request, session, container_ids
+        )
+        messages = [
+            self._format_sse_html_message(container_id, html, event_id)
+            for container_id, html in rendered
+        ]
+        if reload_ids:
+            messages.append(self._format_sse_message(reload_ids, event_id))
+        return "".join(messages)
+
+    async def _cancel_session_cleanup(self, session_id: str) -> None:
+        async with self._active_session_cleanup_tasks_lock:
+            if cleanup_task := self._active_session_cleanup_tasks.pop(session_id, None):
+                cleanup_task.cancel()
+
+    async def _schedule_session_cleanup(self, session_id: str) -> None:
+        """Delete the session if the client doesn't reconnect in time"""
+
+        async def delete_session():
+            await asyncio.sleep(self._session_delete_timeout)
+            await SessionStorage.delete_session(session_id)
+
+        cleanup_task = asyncio.create_task(delete_session())
+
+        async with self._active_session_cleanup_tasks_lock:
+            self._active_session_cleanup_tasks[session_id] = cleanup_task
+
     def _register_sse_endpoint(
         self, dependencies: Sequence[params.Depends] | None = None
     ):
         async def sse_endpoint(request: Request, last_event: str | None = None):
             session: Session = request.state.session
             sid = session.id
-            message_template = "data: {event_id}\n\n"
-
-            async with self._active_session_cleanup_tasks_lock:
-                if cleanup_task := self._active_session_cleanup_tasks.pop(sid, None):
-                    cleanup_task.cancel()
+            # set by EventSource when it reconnects, the query parameter after a page reload
+            last_event_id = self._parse_event_id(
+                request.headers.get("last-event-id") or last_event
+            )
 
-            async def delete_session():
-                await asyncio.sleep(self._session_delete_timeout)
-                await SessionStorage.delete_session(sid)
+            await self._cancel_session_cleanup(sid)
 
             async def event_stream():
+                session.stream_opened()
                 try:
-                    if last_event:
-                        for event_id in session.get_missed_events(last_event):
-                            yield message_template.format(event_id=event_id)
+                    if last_event_id is not None:
+                        if missed_events := session.get_missed_events(last_event_id):
+                            yield self._format_sse_message(
+                                missed_events, session.last_event_id
+                            )
 
                     while True:
-                        component_id = await session.get_updated_component_id()
-                        yield message_template.format(event_id=component_id)
-                        await asyncio.sleep(self._sse_tick_interval)
+                        component_ids = await session.get_updated_component_ids()
+                        event_id = session.last_event_id
+
+                        if self._sse_push_html:
+                            yield await self._render_sse_messages(
+                                request, session, component_ids, event_id
+                            )
+                        else:
+                            yield self._format_sse_message(component_ids, event_id)
+
+                        if self._sse_tick_interval:
+                            await asyncio.sleep(self._sse_tick_interval)
                 except asyncio.CancelledError:
-                    cleanup_task = asyncio.create_task(delete_session())
-
-                    async with self._active_session_cleanup_tasks_lock:
-                        self._active_session_cleanup_tasks[sid] = cleanup_task
+                    await self._schedule_session_cleanup(sid)
+                finally:
+                    session.stream_closed()
 
             return StreamingResponse(
                 event_stream(),
@@ -192,12 +544,363 @@ class LazyFastRouter(APIRouter):
             dependencies=dependencies,
         )
 
+    async def _solve_router_dependencies(
+        self, request: Request, stack: AsyncExitStack
+    ) -> bool:
+        """Resolve the dependencies of the router for a connection, which is not a route of it"""
+        if not self._router_dependencies:
+            return True
+
+        path = request.url.path
+        dependant = get_dependant(path=path, call=lambda: None)
+        for depends in reversed(self._router_dependencies):
+            dependant.dependencies.insert(
+                0, get_parameterless_sub_dependant(depends=depends, path=path)
+            )
+
+        try:
+            solved = await solve_dependencies(
+                request=request,
+                dependant=dependant,
+                body=None,
+                dependency_overrides_provider=_DependencyOverrides(
+                    getattr(request.app, "dependency_overrides", {})
+                ),
+                async_exit_stack=stack,
+                embed_body_fields=False,
+            )
+        except HTTPException:
+            return False
+        return not solved.errors
+
+    async def _reload_over_websocket(
+        self, request: Request, session: Session, message: Any
+    ) -> dict[str, Any]:
+        """Render a component for a reload request received over the WebSocket"""
+        try:
+            component_id = str(message["cid"])
+            inputs = {str(key): str(value) for key, value in message["inputs"].items()}
+        except (KeyError, TypeError, AttributeError):
+            return {"type": "error", "detail": "Invalid reload request"}
+
+        try:
+            component = session.get_component(component_id)
+        except KeyError:
+            return {"type": "expired"}
+
+        response = Response()
+        background_tasks = BackgroundTasks()
+        context.set_request(request, response, background_tasks)
+
+        if self._sse_push_html:
+            # before the view, which can commit a state change that pushes the component
+            component._last_inputs = {
+                key: value for key, value in inputs.items() if key != "csrf"
+            }
+
+        async with AsyncExitStack() as stack:
+            html = await self._render_component_view(
+                component, request, response, background_tasks, stack, inputs=inputs
+            )
+
+        if html is None:
+            # e.g. a failed dependency, the HTTP request gets the proper error response
+            return {"type": "http", "id": component.container_id}
+
+        await background_tasks()
+        await SessionStorage.save_session(session)
+        return {"type": "html", "id": component.container_id, "html": html}
+
+    async def _send_updates_over_websocket(
+        self,
+        websocket: WebSocket,
+        request: Request,
+        session: Session,
+        container_ids: list[str],
+    ) -> None:
+        event_id = session.last_event_id
+        if not self._sse_push_html:
+            await websocket.send_json(
+                {"type": "reload", "ids": container_ids, "seq": event_id}
+            )
+            return
+
+        rendered, reload_ids = await self._render_updated_components(
+            request, session, container_ids
+        )
+        for container_id, html in rendered:
+            await websocket.send_json(
+                {"type": "html", "id": container_id, "html": html, "seq": event_id}
+            )
+        if reload_ids:
+            await websocket.send_json(
+                {"type": "reload", "ids": reload_ids, "seq": event_id}
+            )
+
+    def _register_websocket_endpoint(self):
+        async def receive_empty_body() -> dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def websocket_endpoint(websocket: WebSocket):
+            # browsers send cookies with cross-site WebSocket handshakes, unlike with fetch and SSE
+            if (origin := websocket.headers.get("origin")) and urlsplit(
+                origin
+            ).netloc != websocket.headers.get("host"):
+                await websocket.close(code=1008)
+                return
+
+            session_id = websocket.cookies.get(self._session_cookie_key)
+            session = await SessionStorage.get_session(session_id) if session_id else None
+            if not session:
+                await websocket.close(code=1008)
+                return
+
+            session.set_prefix_path(
+                extract_pattern(
+                    websocket.url.path, self.prefix, self._loader_route_prefix
+                )
+            )
+            context.set_session(session)
+
+            async with AsyncExitStack() as stack:
+                # components are rendered as POST reload requests of the connection
+                request = Request(
+                    {
+                        **websocket.scope,
+                        "type": "http",
+                        "method": "POST",
+                        "fastapi_inner_astack": stack,
+                        "fastapi_function_astack": stack,
+                    },
+                    receive_empty_body,
+                )
+                request.state.session = session
+
+                if not await self._solve_router_dependencies(request, stack):
+                    await websocket.close(code=1008)
+                    return
+
+                await websocket.accept()
+                await self._cancel_session_cleanup(session.id)
+                receive_task = update_task = None
+                session.stream_opened()
+
+                try:
+                    last_event_id = self._parse_event_id(
+                        websocket.query_params.get("last_event")
+                    )
+                    if last_event_id is not None:
+                        if missed_events := session.get_missed_events(last_event_id):
+                            await websocket.send_json(
+                                {
+                                    "type": "reload",
+                                    "ids": missed_events,
+                                    "seq": session.last_event_id,
+                                }
+                            )
+
+                    while True:
+                        receive_task = receive_task or asyncio.ensure_future(
+                            websocket.receive_text()
+                        )
+                        update_task = update_task or asyncio.ensure_future(
+                            session.get_updated_component_ids()
+                        )
+                        done, _ = await asyncio.wait(
+                            {receive_task, update_task},
+                            return_when=asyncio.FIRST_COMPLETED,
+                        )
+
+                        if receive_task in done:
+                            text = receive_task.result()
+                            receive_task = None
+                            try:
+                                message = json.loads(text)
+                            except ValueError:
+                                message = None
+                            await websocket.send_json(
+                                await self._reload_over_websocket(
+                                    request, session, message
+                                )
+                            )
+
+                        if update_task in done:
+                            container_ids = update_task.result()
+                            update_task = None
+                            await self._send_updates_over_websocket(
+                                websocket, request, session, container_ids
+                            )
+                except WebSocketDisconnect:
+                    pass
+                finally:
+                    for task in (receive_task, update_task):
+                        if task:
+                            task.cancel()
+                    session.stream_closed()
+                    await self._schedule_session_cleanup(session.id)
+
+        # a plain route, the session and the dependencies are resolved once per connection
+        self.add_websocket_route(
+            self.prefix + url_join(self._loader_route_prefix, "ws"),
+            websocket_endpoint,
+        )
+
+    def _register_batch_endpoint(self):
+        async def batch_endpoint(
+            request: Request, response: Response, background_tasks: BackgroundTasks
+        ) -> str:
+            session: Session = request.state.session
+            form = await request.form()
+            component_ids = form.get("__cids__", "")
+            parts = []
+
+            context.clear_prerender_components()
+
+            try:
+                components = [
+                    session.get_component(component_id)
+                    for component_id in filter(None, component_ids.split(","))
+                ]
+            except KeyError:
+                # the loaders have no trigger of their own, the client renders the page again
+                raise HTTPException(status_code=410, detail="Component has expired")
+
+            async with AsyncExitStack() as stack:
+                for component in components:
+                    content = await self._render_component_view(
+                        component, request, response, background_tasks, stack
+                    )
+
+                    if content is None:
+                        parts.append(component._fallback_loader_html())
+                    else:
+                        swap = SWAPPING_METHODS_MAP[component._swapping_method]
+                        container_id = html_utils.escape(component.container_id, quote=True)
+                        parts.append(
+                            f'<div id="{container_id}" hx-swap-oob="{swap}">{content}</div>'
+                        )
+
+            await SessionStorage.save_session(session)
+            return "".join(parts)
+
+        self.add_api_route(
+            url_join(self._loader_route_prefix, "batch"),
+            batch_endpoint,
+            response_class=HTMLResponse,
+            methods=["POST"],
+            include_in_schema=False,
+        )
+
+    async def _render_component_view(
+        self,
+        component: Component,
+        request: Request,
+        response: Response,
+        background_tasks: BackgroundTasks,
+        stack: AsyncExitStack,
+        inputs: dict[str, str] | None = None,
+    ) -> str | None:
+        """Render a component view outside of its own endpoint.
+
+        View dependencies are resolved against the component url, reusing the session
+        and the form data of the current request. If inputs are given, they are used as
+        the form data of a POST request instead. Returns None if the component has
+        to be loaded by its own request instead.
+        """
+        if not (target := self._component_targets.get(type(component))):
+            return None
+
+        dependant, path_regex, param_convertors, render = target
+        url = urlsplit(component.load_url)
+        form = await request.form() if inputs is None else inputs
+        path_params = {}
+
+        if match := path_regex.search(url.path):
+            path_params = {
+                key: param_convertors[key].convert(value)
+                for key, value in match.groupdict().items()
+            }
+
+        scope = {
+            **request.scope,
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "path_params": path_params,
+            # dependencies with yield are closed with the stack of this render
+            "fastapi_inner_astack": stack,
+            "fastapi_function_astack": stack,
+        }
+        if inputs is not None:
+            scope["method"] = "POST"
+
+        async def load_form_data() -> dict[str, str]:
+            return dict(form)
+
+        overrides = _DependencyOverrides(
+            {
+                **getattr(request.app, "dependency_overrides", {}),
+                _load_form_data: load_form_data,
+            }
+        )
+
+        component_request = Request(scope, request.receive)
+
+        try:
+            if inputs is not None:
+                # router dependencies are not part of the view dependant
+                ReloadRequest(component_request, dict(inputs))
+
+            solved = await solve_dependencies(
+                request=component_request,
+                dependant=dependant,
+                body=form,
+                background_tasks=background_tasks,
+                response=response,
+                dependency_overrides_provider=overrides,
+                async_exit_stack=stack,
+                embed_body_fields=False,
+            )
+
+            if solved.errors:
+                return None
+
+            return await render(**solved.values)
+        except HTTPException:
+            return None
+
+    async def _prerender_components(self) -> None:
+        if not (request_scope := context.get_request()):
+            return
+
+        request, response, background_tasks = request_scope
+
+        components = context.get_prerender_components()
+
+        async with AsyncExitStack() as stack:
+            while components:
+                component = components.pop(0)
+                content = await self._render_component_view(
+                    component, request, response, background_tasks, stack
+                )
+
+                if content is None:
+                    component._container.hx.set_trigger(
+                        f"load, {component.container_id}"
+                    )
+                else:
+                    component._container.clear_children()
+                    component._container.content = content
+                    component._container.allow_unsafe_html = True
+
     @staticmethod
     def _replace_self(method: Callable) -> Callable:
         async def load_component_instance(__cid__: str) -> Type[Component] | None:
             session = context.get_session()
-            component = session.get_component(__cid__)
-            return component
+            try:
+                return session.get_component(__cid__)
+            except KeyError:
+                raise HTTPException(status_code=410, detail="Component has expired")
 
         sig = inspect.signature(method)
 
@@ -225,6 +928,8 @@ class LazyFastRouter(APIRouter):
         html_lang: str = "en",
         head_renderer: Callable | None = None,
         dependencies: Sequence[Depends] | None = None,
+        stream: bool = False,
+        prerender: bool = False,
     ):
         """Register a page
 
@@ -234,6 +939,10 @@ class LazyFastRouter(APIRouter):
             head_renderer (Callable | None, optional): A function that render html tags to head section.
                 For example, it can be used to render meta, link, stryle or script tags
             dependencies (Sequence[Depends], optional): List of fastapi dependencies.
+            stream (bool, optional): Send the page as a chunked streaming response. Defaults to False.
+                See `component` for details.
+            prerender (bool, optional): Render all components of the page inline in the page response
+                instead of loading them with extra requests. Defaults to False.
 
         Returns:
             Callable: A decorator that registers the page
@@ -251,8 +960,18 @@ class LazyFastRouter(APIRouter):
         def init_js_scripts(session: Session):
             with tags.html(lang=html_lang):
                 with tags.head():
-                    tags.script(src=self._htmx_cdn)
-                    tags.script(self._js_script)
+                    if self._js_asset:
+                        tags.script(
+                            src=url_join(
+                                session.prefix_path or "/",
+                                self._loader_route_prefix,
+                                "static",
+                                self._js_asset.filename,
+                            )
+                        )
+                    else:
+                        tags.script(src=self._htmx_cdn)
+                        tags.script(self._js_script)
 
                     if head_renderer:
                         head_renderer()
@@ -264,6 +983,17 @@ class LazyFastRouter(APIRouter):
                     path_params=None,
                 )
                 dataset = {"sse": sse_url, "hx-ext": "morphdom-swap"}
+
+                if self._websocket_transport:
+                    dataset["ws"] = url_join(
+                        session.prefix_path or "/", self._loader_route_prefix, "ws"
+                    )
+
+                if self._batch_loading:
+                    dataset["batch"] = url_join(
+                        session.prefix_path or "/", self._loader_route_prefix, "batch"
+                    )
+
                 with tags.body(dataset=dataset):
                     tags.input(
                         id=self._csrf_input_id,
@@ -284,6 +1014,8 @@ class LazyFastRouter(APIRouter):
                 path=path,
                 dependencies=dependencies,
                 template_renderer=init_js_scripts,
+                stream=stream,
+                prerender=prerender,
             )(PageComponent)
 
         return decorator
@@ -297,8 +1029,14 @@ class LazyFastRouter(APIRouter):
         reload_on: list[StateField] | None = None,
         template_renderer: Callable | None = None,
         preload_renderer: Callable | None = None,
+        cache_preload: bool = False,
         class_: str | None = None,
         swapping_method: Literal["replace", "append", "prepend"] = "replace",
+        stream: bool = False,
+        prerender: bool = False,
+        scope: Literal["session", "global"] = "session",
+        cache_max_age: int | None = None,
+        cancel_superseded: bool = False,
     ):
         """Register a component
 
@@ -313,14 +1051,38 @@ class LazyFastRouter(APIRouter):
                 Component id must be specified if reload_on is used. Works only if state_schema is set on router
             template_renderer (Callable | None, optional): A function that render html tags extra to the component div
             preload_renderer (Callable | None, optional): A function that preloads the component content. For example skeletons
+            cache_preload (bool, optional): Call preload_renderer once, when the component is registered, and reuse
+                its html for every instance. Use it for static skeletons, the function gets no session. Defaults to False.
             class_ (str | None, optional): The class of the component div
             swapping_method (Literal["replace", "append", "prepend"], optional): How old content will be replaced with new content
-            
+            stream (bool, optional): Send the rendered html as a chunked `StreamingResponse`. Defaults to False.
+                The template is flushed before the view runs, and root tags of an async view are flushed
+                as soon as they are closed. Exceptions raised by the view after the first chunk can no longer
+                change the response status.
+            prerender (bool, optional): Render the component view inline in the response that creates the
+                component, instead of loading it with an extra request. Dependencies are resolved from
+                that request. The container keeps its trigger, so the component can still be reloaded.
+                Defaults to False.
+            scope (Literal["session", "global"], optional): With "global", the rendered view is shared by all
+                sessions and cached by the component fields and the resolved view arguments, which must be
+                hashable. Concurrent requests for a missing entry wait for a single render. Use it only for
+                views that don't depend on the session and don't create nested components.
+                Defaults to "session".
+            cache_max_age (int, optional): Lifetime of a shared render in seconds. Defaults to None (until evicted).
+            cancel_superseded (bool, optional): When a newer reload request of the same component arrives
+                while its view is still rendering, the older render runs to the end, and only its response
+                is dropped. Set it to True to cancel the older render at its next await instead, which saves
+                the rest of its work. Only use it for views without side effects: a view cancelled in the
+                middle of a database write or an `async with state:` block leaves that work half done.
+                Either way the older request gets an empty 204 response, and the browser aborts it.
+                Defaults to False.
+
         Returns:
             Callable: A decorator that registers the component
 
         Raises:
             ValueError: If id is not specified and reload_on is used
+            ValueError: If the global scope is used with stream or template_renderer
             TypeError: If the class is not a subclass of Component
 
         Example:
@@ -346,6 +1108,11 @@ class LazyFastRouter(APIRouter):
                 path or url_join(self._loader_route_prefix, cls.__name__),
             )
 
+            if scope == "global" and (stream or template_renderer):
+                raise ValueError(
+                    "global scope can't be used with stream or template_renderer"
+                )
+
             if reload_on:
                 if not id:
                     raise ValueError("id must be specified if reload_on is used")
@@ -353,20 +1120,44 @@ class LazyFastRouter(APIRouter):
                     raise ValueError(
                         "state_schema must be set on the router if reload_on is used"
                     )
-                for state_field in reload_on:
-                    state_field.register_component_reload(id)
 
             setattr(cls, "_container_id", id)
             setattr(cls, "_url", url)
             setattr(cls, "_class", class_)
             setattr(cls, "_loader_class", self._loader_class)
-            setattr(cls, "_preload_renderer", preload_renderer)
+            # a plain function attribute would be bound to the instance
+            setattr(
+                cls,
+                "_preload_renderer",
+                staticmethod(preload_renderer) if preload_renderer else None,
+            )
             setattr(cls, "_loader_route_prefix", self._loader_route_prefix)
             setattr(cls, "_csrf_input_id", self._csrf_input_id)
             setattr(cls, "_swapping_method", swapping_method)
+            setattr(cls, "_batch_loading", self._batch_loading)
+            setattr(cls, "_prerender", prerender and not template_renderer)
+            setattr(
+                cls,
+                "_shell",
+                ComponentShell(
+                    url,
+                    self._loader_class,
+                    class_,
+                    self._csrf_input_id,
+                    swapping_method,
+                    preload_renderer,
+                    cache_preload,
+                ),
+            )
+            setattr(
+                cls,
+                "_reload_on",
+                tuple(state_field.name for state_field in reload_on or ()),
+            )
 
-            @wraps(view_func)
-            async def endpoint(*args, **kwargs):
+            async def render(*args, **kwargs) -> str:
+                # the stack and the root tags are shared by a context copied from the parent task
+                context.clear_tag_stack()
                 context.clear_root_tags()
 
                 if template_renderer:
@@ -377,24 +1168,149 @@ class LazyFastRouter(APIRouter):
                     if is_async:
                         await view_func(*args, **kwargs)
                     else:
-                        view_func(*args, **kwargs)
+                        await self._run_sync_view(lambda: view_func(*args, **kwargs))
 
                     root_tags = context.get_root_tags()
+                    await self._prerender_components()
                     html = "".join(tag.html() for tag in root_tags)
                     return html
 
                 finally:
                     context.clear_root_tags()
 
+            if scope == "global":
+                render_in_session = render
+
+                async def render(*args, **kwargs) -> str:
+                    instance = kwargs.get("self")
+                    key = (
+                        f"{cls.__module__}.{cls.__qualname__}",
+                        instance.model_dump_json() if instance else None,
+                        tuple(item for item in kwargs.items() if item[0] != "self"),
+                    )
+                    try:
+                        hash(key)
+                    except TypeError:
+                        return await render_in_session(*args, **kwargs)
+
+                    html, _ = await render_shared(
+                        key, lambda: render_in_session(*args, **kwargs), cache_max_age
+                    )
+                    return html
+
+            @wraps(view_func)
+            async def endpoint(*args, **kwargs):
+                context.clear_prerender_components()
+                context.set_prerender_enabled(prerender and bool(template_renderer))
+
+                session = context.get_session()
+                reload_request = context.get_reload_request()
+
+                instance = kwargs.get("self")
+
+                if self._sse_push_html and instance and reload_request:
+                    # rendered again with these inputs when its html is pushed over SSE,
+                    # set before the view, which can commit a state change that pushes it
+                    instance._last_inputs = {
+                        key: value
+                        for key, value in reload_request.inputs.items()
+                        if key != "csrf" and isinstance(value, str)
+                    }
+
+                if instance:
+                    html = await self._render_latest(
+                        (session.id, instance.component_id),
+                        lambda: render(*args, **kwargs),
+                        cancel_superseded,
+                    )
+                    if html is None:
+                        return Response(status_code=204)
+                else:
+                    html = await render(*args, **kwargs)
+
+                await SessionStorage.save_session(session)
+                return html
+
+            dependant = get_dependant(path=url, call=endpoint)
+            for depends in reversed(dependencies or []):
+                dependant.dependencies.insert(
+                    0, get_parameterless_sub_dependant(depends=depends, path=url)
+                )
+
+            async def stream_endpoint(
+                request: Request, response: Response, background_tasks: BackgroundTasks
+            ) -> StreamingResponse:
+                context.clear_prerender_components()
+                context.set_prerender_enabled(prerender and bool(template_renderer))
+
+                # the view runs after the endpoint has returned, so its dependencies are
+                # solved here, with a stack that is closed when the stream is finished
+                stack = AsyncExitStack()
+                try:
+                    solved = await solve_dependencies(
+                        request=request,
+                        dependant=dependant,
+                        body=await request.form() if dependant.body_params else None,
+                        background_tasks=background_tasks,
+                        response=response,
+                        dependency_overrides_provider=_DependencyOverrides(
+                            getattr(request.app, "dependency_overrides", {})
+                        ),
+                        async_exit_stack=stack,
+                        embed_body_fields=False,
+                    )
+                    if solved.errors:
+                        raise RequestValidationError(solved.errors)
+                except BaseException:
+                    await stack.aclose()
+                    raise
+
+                async def stream_html() -> AsyncIterator[str]:
+                    try:
+                        async for chunk in self._stream_root_tags(
+                            lambda: view_func(**solved.values),
+                            is_async,
+                            template_renderer,
+                        ):
+                            yield chunk
+                    finally:
+                        await stack.aclose()
+
+                # closes the stack if the stream is never started, e.g. the client is gone
+                background_tasks.add_task(stack.aclose)
+
+                streaming_response = StreamingResponse(stream_html(), media_type="text/html")
+                streaming_response.headers.raw.extend(response.headers.raw)
+                self._set_session_cookie(streaming_response, context.get_session())
+                return streaming_response
+
             self.add_api_route(
                 url,
-                endpoint,
-                dependencies=dependencies,
-                response_class=HTMLResponse,
+                stream_endpoint if stream else endpoint,
+                # a streamed view solves them by itself
+                dependencies=None if stream else dependencies,
+                response_class=StreamingResponse if stream else HTMLResponse,
                 methods=["GET", "POST"],
                 include_in_schema=False,
             )
 
+            if not template_renderer:
+                path_regex, _, param_convertors = compile_path(url)
+                # component urls can be mounted under extra prefixes, match the tail only
+                path_regex = re.compile(path_regex.pattern.lstrip("^"))
+
+                self._component_targets[cls] = (
+                    dependant,
+                    path_regex,
+                    param_convertors,
+                    render,
+                )
+
             return cls
 
         return decorator
+
+
+class _DependencyOverrides:
+    def __init__(self, dependency_overrides: dict[Callable, Callable]) -> None:
+        self.dependency_overrides = dependency_overrides
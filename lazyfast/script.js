@@ -18,6 +18,15 @@ function throttle(func, wait = 1000) {
   };
 }
 
+function debounce(func, wait) {
+  let timeout = null;
+
+  return function (...args) {
+    clearTimeout(timeout);
+    timeout = setTimeout(() => func.apply(this, args), wait);
+  };
+}
+
 function reloadComponent(element, event) {
   const componentLoader = element.closest('.__componentLoader__');
   const indicatorElmClass = element.closest('[data-htmx-indicator-class]');
@@ -35,16 +44,42 @@ function reloadComponent(element, event) {
     }
   }
 
-  const extraVals = JSON.stringify({ __tid__: element.id, __evt__: event?.type });
-  componentLoader.setAttribute('hx-vals', extraVals);
-  htmx.trigger(componentLoader, componentLoader.id);
+  const extraVals = { __tid__: element.id, __evt__: event?.type };
+  componentLoader.setAttribute('hx-vals', JSON.stringify(extraVals));
+
+  if (!sendReloadOverWebSocket(componentLoader, extraVals)) {
+    htmx.trigger(componentLoader, componentLoader.id);
+  }
 }
 
 function preventFormSubmission(event) {
   event.preventDefault();
 }
 
-const throttledReloadComponent = throttle(reloadComponent);
+// every element gets its own limiter, configured by its data-reload-debounce or data-reload-throttle
+const reloadLimiters = new WeakMap();
+
+function createReloadLimiter(element) {
+  const { reloadDebounce, reloadThrottle } = element.dataset;
+
+  if (reloadDebounce !== undefined) {
+    return debounce(reloadComponent, Number(reloadDebounce));
+  }
+  if (reloadThrottle !== undefined) {
+    return Number(reloadThrottle) > 0 ? throttle(reloadComponent, Number(reloadThrottle)) : reloadComponent;
+  }
+  return throttle(reloadComponent);
+}
+
+function throttledReloadComponent(element, event) {
+  let limiter = reloadLimiters.get(element);
+
+  if (!limiter) {
+    limiter = createReloadLimiter(element);
+    reloadLimiters.set(element, limiter);
+  }
+  limiter(element, event);
+}
 
 
 function saveInputData() {
@@ -74,29 +109,299 @@ htmx.on('htmx:afterSettle', function (evt) {
   restoreInputDataForElement(evt.target);
 });
 
+// a page with more components than the session keeps expires again right after
+// the reload, so it is reloaded at most once in this interval
+const EXPIRED_RELOAD_INTERVAL = 10000;
+
+function reloadExpiredPage() {
+  const lastReload = Number(sessionStorage.getItem('lazyfast_expired_reload'));
+  if (lastReload && Date.now() - lastReload < EXPIRED_RELOAD_INTERVAL) {
+    return;
+  }
+  sessionStorage.setItem('lazyfast_expired_reload', Date.now());
+  saveInputData();
+  document.location.reload();
+}
+
+htmx.on('htmx:responseError', function (evt) {
+  // the component instance was released by the server, render the page again
+  if (evt.detail.xhr.status === 410) {
+    reloadExpiredPage();
+  }
+});
+
+
+let batchLoadScheduled = false;
+
+function loadPendingComponents() {
+  batchLoadScheduled = false;
+
+  const batchUrl = document.body.dataset.batch;
+  const loaders = document.querySelectorAll('[data-batch-cid]');
+
+  if (!batchUrl || !loaders.length) {
+    return;
+  }
+
+  const componentIds = [];
+  loaders.forEach(loader => {
+    componentIds.push(loader.dataset.batchCid);
+    loader.removeAttribute('data-batch-cid');
+  });
+
+  htmx.ajax('POST', batchUrl, {
+    source: document.body,
+    swap: 'none',
+    values: {
+      __cids__: componentIds.join(','),
+      csrf: document.getElementsByName('csrf')[0].value,
+    },
+  });
+}
+
+htmx.onLoad(function (elt) {
+  if (batchLoadScheduled || !document.body.dataset.batch) {
+    return;
+  }
+  if (elt.matches('[data-batch-cid]') || elt.querySelector('[data-batch-cid]')) {
+    batchLoadScheduled = true;
+    setTimeout(loadPendingComponents, 0);
+  }
+});
+
+
+function getInputKey(input) {
+  if (input.type === 'hidden') {
+    return '';
+  }
+  if (input.type === 'radio') {
+    return `${input.name || input.id}:${input.value}`;
+  }
+  return input.name || input.id;
+}
+
+function swapComponentContent(target, content) {
+  // keep what the user typed since the last reload, as the inputs posted by a reload request do
+  const values = new Map();
+  target.querySelectorAll('input, textarea, select').forEach(input => {
+    const key = getInputKey(input);
+    if (key) {
+      values.set(key, input.type === 'checkbox' || input.type === 'radio' ? input.checked : input.value);
+    }
+  });
+
+  const focused = target.contains(document.activeElement) ? document.activeElement : null;
+  const focusedKey = focused ? getInputKey(focused) : '';
+  const selection = focused && 'selectionStart' in focused
+    ? [focused.selectionStart, focused.selectionEnd]
+    : null;
+
+  const swapStyle = (target.getAttribute('hx-swap') || 'innerHTML').split(' ')[0];
+  htmx.swap(target, content, { swapStyle: swapStyle });
+
+  target.querySelectorAll('input, textarea, select').forEach(input => {
+    const key = getInputKey(input);
+    if (!values.has(key)) {
+      return;
+    }
+    if (input.type === 'checkbox' || input.type === 'radio') {
+      input.checked = values.get(key);
+    } else {
+      input.value = values.get(key);
+    }
+    if (key === focusedKey) {
+      input.focus();
+      if (selection) {
+        try {
+          input.setSelectionRange(selection[0], selection[1]);
+        } catch (error) {
+          // the input type does not support selection
+        }
+      }
+    }
+  });
+}
+
+
+// open WebSocket of the page, reloads are sent over HTTP without it
+let componentSocket = null;
+
+function collectInputValues(elements, values) {
+  elements.forEach(input => {
+    if (!input.name || input.disabled) {
+      return;
+    }
+    if ((input.type === 'checkbox' || input.type === 'radio') && !input.checked) {
+      return;
+    }
+    if (input.tagName === 'SELECT' && input.multiple) {
+      Array.from(input.selectedOptions).forEach(option => {
+        values[input.name] = option.value;
+      });
+      return;
+    }
+    values[input.name] = input.value;
+  });
+}
+
+function sendReloadOverWebSocket(componentLoader, extraVals) {
+  if (!componentSocket || componentSocket.readyState !== WebSocket.OPEN) {
+    return false;
+  }
+
+  const form = componentLoader.closest('form');
+  const fields = 'input, select, textarea';
+
+  // files can't be sent over the WebSocket
+  if ((form || componentLoader).querySelector('input[type="file"]')) {
+    return false;
+  }
+
+  // the same values as the htmx request: the closest form, the container and the CSRF token
+  const inputs = {};
+  if (form) {
+    collectInputValues(form.querySelectorAll(fields), inputs);
+  }
+  collectInputValues(componentLoader.querySelectorAll(fields), inputs);
+  collectInputValues(document.getElementsByName('csrf'), inputs);
+
+  Object.entries(extraVals).forEach(([key, value]) => {
+    if (value !== undefined) {
+      inputs[key] = value;
+    }
+  });
+
+  const url = new URL(componentLoader.getAttribute('hx-post'), document.location.href);
+  componentSocket.send(JSON.stringify({ cid: url.searchParams.get('__cid__'), inputs: inputs }));
+  return true;
+}
+
+// id of the last reload event received from the server, per tab and per endpoint:
+// sessionStorage survives the page reload after a connection break, but is not shared between tabs
+function lastEventKey(path) {
+  return `lazyfast_last_event:${path}`;
+}
+
+function handleSocketMessage(event) {
+  const message = JSON.parse(event.data);
+
+  if (message.seq !== undefined) {
+    sessionStorage.setItem(lastEventKey(document.body.dataset.ws), message.seq);
+  }
+
+  if (message.type === 'html') {
+    const target = document.getElementById(message.id);
+    if (target) {
+      swapComponentContent(target, message.html);
+    }
+  } else if (message.type === 'reload') {
+    message.ids.forEach(componentId => {
+      const target = document.getElementById(componentId);
+      if (target) {
+        reloadComponent(target);
+      }
+    });
+  } else if (message.type === 'http') {
+    // the server could not render it over the WebSocket, repeat the reload over HTTP
+    const componentLoader = document.getElementById(message.id);
+    if (componentLoader) {
+      htmx.trigger(componentLoader, componentLoader.id);
+    }
+  } else if (message.type === 'expired') {
+    reloadExpiredPage();
+  }
+}
+
+function connectWebSocket(path) {
+  const url = new URL(path, document.location.href);
+  url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:';
+
+  const lastEvent = sessionStorage.getItem(lastEventKey(path));
+  if (lastEvent) {
+    url.searchParams.set('last_event', lastEvent);
+  }
+
+  const socket = new WebSocket(url);
+  let opened = false;
+
+  socket.onopen = function () {
+    opened = true;
+    componentSocket = socket;
+  };
+
+  socket.onmessage = handleSocketMessage;
+
+  socket.onclose = function () {
+    componentSocket = null;
+
+    if (opened) {
+      saveInputData();
+      document.location.reload();
+    } else {
+      connectEventSource();
+    }
+  };
+}
+
 
 window.onload = function () {
-  let sse = document.body.dataset.sse;
+  const ws = document.body.dataset.ws;
+
+  if (ws && 'WebSocket' in window) {
+    connectWebSocket(ws);
+  } else {
+    connectEventSource();
+  }
+}
+
+function connectEventSource() {
+  const sse = document.body.dataset.sse;
 
   if (!sse) {
     return;
   }
 
-  const lastEvent = localStorage.getItem("sse_last_event");
+  // EventSource sends the Last-Event-ID header by itself only when it reconnects
+  const url = new URL(sse, document.location.href);
+  const lastEvent = sessionStorage.getItem(lastEventKey(sse));
 
   if (lastEvent) {
-    sse = `${sse}?last_event=${lastEvent}`;
+    url.searchParams.set('last_event', lastEvent);
   }
 
-  const sseSource = new EventSource(sse);
+  const sseSource = new EventSource(url);
+
+  function saveLastEventId(event) {
+    if (event.lastEventId) {
+      sessionStorage.setItem(lastEventKey(sse), event.lastEventId);
+    }
+  }
 
   sseSource.onmessage = function (event) {
-    const target = document.getElementById(event.data);
-    localStorage.setItem("sse_last_event", event.data);
+    saveLastEventId(event);
+    // one message carries all pending component ids, one per line
+    const componentIds = event.data.split('\n');
+
+    componentIds.forEach(componentId => {
+      const target = document.getElementById(componentId);
+      if (target) {
+        reloadComponent(target);
+      }
+    });
+  };
+
+  // html of a component rendered by the server: the container id, then the content
+  sseSource.addEventListener('html', function (event) {
+    const separator = event.data.indexOf('\n');
+    const containerId = separator === -1 ? event.data : event.data.slice(0, separator);
+    const content = separator === -1 ? '' : event.data.slice(separator + 1);
+    saveLastEventId(event);
+
+    const target = document.getElementById(containerId);
     if (target) {
-      reloadComponent(target);
+      swapComponentContent(target, content);
     }
-  };
+  });
 
   sseSource.onerror = function (error) {
     saveInputData();
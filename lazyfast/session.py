@@ -1,7 +1,9 @@
-from collections import deque
-import asyncio, uuid
-from typing import Generator, Type
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import asyncio, pickle, threading, time, uuid
+from typing import Any, Protocol, Type
 
+from lazyfast import context
 from lazyfast.cache import Cache
 from lazyfast.component import Component
 from lazyfast.request import ReloadRequest
@@ -9,23 +11,86 @@ from lazyfast.state import State
 from lazyfast.utils import generate_csrf_token
 
 
+class EventLog:
+    """Ring buffer of the reload events sent to a session, numbered with increasing sequence numbers.
+
+    The event with a sequence number is stored at its number modulo the buffer size,
+    so the events after a given number are found without a search.
+
+    Args:
+        max_events (int, optional): Number of the latest events kept. Defaults to 10.
+        max_age (float | None, optional): Events older than this many seconds are not replayed.
+            Defaults to None (kept until overwritten).
+    """
+
+    def __init__(self, max_events: int = 10, max_age: float | None = None) -> None:
+        self._max_events = max(max_events, 1)
+        self._max_age = max_age
+        # (sequence number, time of the event, container id)
+        self._events: list[tuple[int, float, str] | None] = [None] * self._max_events
+        self._last_seq = 0
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the latest event, 0 if there were no events"""
+        return self._last_seq
+
+    def extend(self, container_ids: list[str]) -> int:
+        """Add events and return the sequence number of the last one"""
+        now = time.monotonic()
+        for container_id in container_ids:
+            self._last_seq += 1
+            self._events[self._last_seq % self._max_events] = (
+                self._last_seq,
+                now,
+                container_id,
+            )
+        return self._last_seq
+
+    def since(self, seq: int) -> list[str]:
+        """Container ids of the retained events after the given sequence number, deduplicated"""
+        first_seq = max(seq + 1, self._last_seq - self._max_events + 1, 1)
+        min_time = (
+            time.monotonic() - self._max_age if self._max_age is not None else None
+        )
+
+        container_ids = {}
+        for event_seq in range(first_seq, self._last_seq + 1):
+            _, event_time, container_id = self._events[event_seq % self._max_events]
+            if min_time is None or event_time >= min_time:
+                container_ids[container_id] = None
+        return list(container_ids)
+
+
 class Session:
     def __init__(
-        self, session_id: str, state: State | None = None, buffer_size: int = 10
+        self,
+        session_id: str,
+        state: State | None = None,
+        buffer_size: int = 10,
+        buffer_max_age: float | None = None,
+        max_components: int | None = None,
+        cache_max_bytes: int | None = 1024 * 1024,
     ) -> None:
         self._session_id = session_id
         self._queue = asyncio.Queue()
-        self._components: dict[int, Type["Component"]] = {}
+        # ordered from the least to the most recently used
+        self._components: OrderedDict[str, Type["Component"]] = OrderedDict()
+        # container id -> id of the latest component rendered into it
+        self._containers: dict[str, str] = {}
+        self._max_components = max_components
+        # sync views create components in worker threads
+        self._lock = threading.RLock()
         self._csrf_token = generate_csrf_token()
         self._prefix_path = None
-        self._reload_request = None
-        self._buffer = deque(maxlen=buffer_size)
-        self._cache = Cache()
+        self._events = EventLog(buffer_size, buffer_max_age)
+        self._cache = Cache(max_bytes=cache_max_bytes)
+        self._state = None
+        # SSE and WebSocket connections of this process that are open
+        self._active_streams = 0
 
         if state:
-            state.set_queue(self._queue)
-
-        self._state = state
+            self.set_state(state)
 
     @property
     def csrf_token(self) -> str | None:
@@ -41,7 +106,8 @@ class Session:
 
     @property
     def reload_request(self) -> ReloadRequest:
-        return self._reload_request
+        """Reload request of the current render, other requests of the session have their own"""
+        return context.get_reload_request()
 
     @property
     def prefix_path(self) -> str | None:
@@ -51,66 +117,391 @@ class Session:
     def cache(self) -> Cache:
         return self._cache
 
+    @property
+    def has_active_stream(self) -> bool:
+        """Whether an SSE or WebSocket connection of the session is open, the page is still live"""
+        return self._active_streams > 0
+
+    def stream_opened(self) -> None:
+        self._active_streams += 1
+
+    def stream_closed(self) -> None:
+        self._active_streams -= 1
+
+    @property
+    def last_event_id(self) -> int:
+        """Sequence number of the latest reload event, sent as the SSE event id"""
+        return self._events.last_seq
+
     def set_reload_request(self, request: ReloadRequest) -> None:
-        self._reload_request = request
+        context.set_reload_request(request)
 
     def set_prefix_path(self, path: str) -> None:
         self._prefix_path = path
 
     def set_state(self, state: State) -> None:
+        state.set_queue(self._queue)
+        state.add_change_listener(self._cache.invalidate_fields)
         self._state = state
 
-    async def get_updated_component_id(self) -> str | None:
-        if not self._state:
-            return
+    async def get_updated_component_ids(self) -> list[str]:
+        """Wait for component reloads and return all pending ones, deduplicated"""
+        component_ids = [await self._queue.get()]
+
+        while not self._queue.empty():
+            component_ids.append(self._queue.get_nowait())
 
-        component_id = await self._state.dequeue()
-        self._buffer.append(component_id)
-        return component_id
+        component_ids = list(dict.fromkeys(component_ids))
+        self._events.extend(component_ids)
+        return component_ids
 
-    def get_missed_events(self, last_event: str) -> Generator[None, None, str]:
-        idx = self._buffer.index(last_event) if last_event in self._buffer else -1
-        if idx != -1:
-            for i, item in enumerate(self._buffer):
-                if i > idx:
-                    yield item
+    def get_missed_events(self, last_event_id: int) -> list[str]:
+        """Container ids of the reload events after the given event id, deduplicated.
+
+        Events that are no longer retained are skipped, an id from the future
+        (e.g. of an older session) gives no events.
+        """
+        if last_event_id >= self._events.last_seq:
+            return []
+        return self._events.since(last_event_id)
 
     def add_component(self, component: Type["Component"]) -> None:
-        self._components[str(id(component))] = component
+        component_id = component.component_id
+        container_id = component.container_id
+
+        with self._lock:
+            self._components[component_id] = component
+
+            # a replaced component is no longer mounted, the new one subscribes by itself
+            if self._containers.get(container_id) not in (None, component_id) and self._state:
+                self._state.unsubscribe(container_id)
+            self._containers[container_id] = component_id
+
+            if self._max_components:
+                while len(self._components) > self._max_components:
+                    component_id, evicted = self._components.popitem(last=False)
+                    if self._containers.get(evicted.container_id) == component_id:
+                        del self._containers[evicted.container_id]
+                        if self._state:
+                            self._state.unsubscribe(evicted.container_id)
 
     def get_component(self, component_id: str) -> Type["Component"]:
-        return self._components[str(component_id)]
+        """Get a component by id
+
+        Raises:
+            KeyError: If the component does not exist or was evicted
+        """
+        component_id = str(component_id)
+        with self._lock:
+            component = self._components[component_id]
+            self._components.move_to_end(component_id)
+        return component
+
+    def find_component(self, container_id: str) -> Type["Component"] | None:
+        """Get the latest component rendered into a container, if it was not evicted"""
+        with self._lock:
+            if component_id := self._containers.get(container_id):
+                return self.get_component(component_id)
+        return None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_queue"]
+        del state["_lock"]
+        # connections stay in the process that serves them
+        state["_active_streams"] = 0
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._queue = asyncio.Queue()
+        self._lock = threading.RLock()
+
+        if self._state:
+            self._state.set_queue(self._queue)
+
+
+class SessionBackend(ABC):
+    """Storage of sessions used by `SessionStorage`"""
+
+    @abstractmethod
+    async def get_session(self, session_id: str) -> Session | None: ...
+
+    @abstractmethod
+    async def save_session(self, session: Session) -> None: ...
+
+    @abstractmethod
+    async def delete_session(self, session_id: str) -> None: ...
+
+    def get_stats(self) -> dict[str, int]:
+        return {}
+
+
+class InMemorySessionBackend(SessionBackend):
+    """Keeps sessions in the memory of the current process.
+
+    Args:
+        ttl (float, optional): Idle time in seconds after which a session expires. Defaults to None (never).
+            A session with an open SSE or WebSocket connection doesn't expire, however long the page is idle.
+        max_sessions (int, optional): Maximum number of sessions, the least recently used
+            sessions are evicted above it. Defaults to None (unbounded).
+        sweep_interval (float, optional): Interval in seconds of the background task which
+            removes expired sessions. Defaults to 60. The task runs only if ttl is set.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_sessions: int | None = None,
+        sweep_interval: float = 60,
+    ) -> None:
+        self._ttl = ttl
+        self._max_sessions = max_sessions
+        self._sweep_interval = sweep_interval
+        self._sweeper: asyncio.Task | None = None
+        # ordered from the least to the most recently used
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        self._evicted = 0
+        self._expired = 0
+
+    def _is_expired(self, session_id: str, now: float) -> bool:
+        return (
+            bool(self._ttl)
+            and now - self._last_access[session_id] > self._ttl
+            and not self._sessions[session_id].has_active_stream
+        )
+
+    def _touch(self, session_id: str, now: float) -> None:
+        self._last_access[session_id] = now
+        self._sessions.move_to_end(session_id)
+
+    def _remove(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+
+    def _start_sweeper(self) -> None:
+        if not self._ttl or (self._sweeper and not self._sweeper.done()):
+            return
+        try:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+        except RuntimeError:
+            pass
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Remove expired sessions and return their number"""
+        now = time.monotonic()
+        removed = 0
+
+        for session_id in list(self._sessions):
+            if self._sessions[session_id].has_active_stream:
+                # live but idle, moved behind the sessions that can still expire
+                self._touch(session_id, now)
+                continue
+            if not self._is_expired(session_id, now):
+                break
+            self._remove(session_id)
+            removed += 1
+
+        self._expired += removed
+        return removed
+
+    async def get_session(self, session_id: str) -> Session | None:
+        if (session := self._sessions.get(session_id)) is None:
+            return None
+
+        now = time.monotonic()
+
+        if self._is_expired(session_id, now):
+            self._remove(session_id)
+            self._expired += 1
+            return None
+
+        self._touch(session_id, now)
+        return session
+
+    async def save_session(self, session: Session) -> None:
+        self._start_sweeper()
+
+        if self._sessions.get(session.id) is session:
+            self._touch(session.id, time.monotonic())
+            return
+
+        async with self._lock:
+            self._sessions[session.id] = session
+            self._touch(session.id, time.monotonic())
+
+            if self._max_sessions:
+                while len(self._sessions) > self._max_sessions:
+                    self._remove(next(iter(self._sessions)))
+                    self._evicted += 1
+
+    async def delete_session(self, session_id: str) -> None:
+        if session_id in self._sessions:
+            async with self._lock:
+                self._remove(session_id)
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "live": len(self._sessions),
+            "evicted": self._evicted,
+            "expired": self._expired,
+        }
+
+
+class KeyValueStore(Protocol):
+    """Subset of an async key-value client API, e.g. `redis.asyncio.Redis`"""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes) -> Any: ...
+
+    async def delete(self, key: str) -> Any: ...
+
+
+class InMemoryKeyValueStore:
+    """`KeyValueStore` kept in a dict, for development and tests"""
+
+    def __init__(self) -> None:
+        self._data: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._data[key] = value
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class KeyValueSessionBackend(SessionBackend):
+    """Keeps serialized sessions in an external key-value store shared by workers.
+
+    Every saved session gets a new version. Sessions read from the store are kept
+    in a local LRU cache, and a cached session is reused without deserialization
+    while its version in the store is unchanged. With sticky sessions, `cache_ttl`
+    lets a cached session be reused without any store request for that many seconds.
+
+    Reload events and SSE streams are not shared, they stay in the worker
+    that serves the SSE connection of the session.
+    """
+
+    def __init__(
+        self,
+        store: KeyValueStore,
+        serializer: Any = pickle,
+        key_prefix: str = "lazyfast:session:",
+        cache_size: int = 1024,
+        cache_ttl: float = 0,
+    ) -> None:
+        self._store = store
+        self._serializer = serializer
+        self._key_prefix = key_prefix
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._cache: OrderedDict[str, tuple[Session, bytes, float]] = OrderedDict()
+
+    def _key(self, session_id: str) -> str:
+        return self._key_prefix + session_id
+
+    def _version_key(self, session_id: str) -> str:
+        return self._key_prefix + session_id + ":version"
+
+    def _cache_session(self, session: Session, version: bytes) -> None:
+        self._cache[session.id] = (session, version, time.monotonic())
+        self._cache.move_to_end(session.id)
+
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def get_session(self, session_id: str) -> Session | None:
+        if cached := self._cache.get(session_id):
+            session, version, cached_at = cached
+
+            if time.monotonic() - cached_at < self._cache_ttl:
+                self._cache.move_to_end(session_id)
+                return session
+
+            if await self._store.get(self._version_key(session_id)) == version:
+                self._cache_session(session, version)
+                return session
+
+        data = await self._store.get(self._key(session_id))
+        if data is None:
+            self._cache.pop(session_id, None)
+            return None
+
+        version = await self._store.get(self._version_key(session_id))
+        session = self._serializer.loads(data)
+        self._cache_session(session, version)
+        return session
+
+    async def save_session(self, session: Session) -> None:
+        version = uuid.uuid4().hex.encode()
+        await self._store.set(self._key(session.id), self._serializer.dumps(session))
+        await self._store.set(self._version_key(session.id), version)
+        self._cache_session(session, version)
+
+    async def delete_session(self, session_id: str) -> None:
+        self._cache.pop(session_id, None)
+        await self._store.delete(self._key(session_id))
+        await self._store.delete(self._version_key(session_id))
 
 
 class SessionStorage:
-    _sessions: dict[str, Session] = {}
-    _lock: asyncio.Lock = asyncio.Lock()
+    _backend: SessionBackend = InMemorySessionBackend()
+
+    @classmethod
+    def set_backend(cls, backend: SessionBackend) -> None:
+        cls._backend = backend
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        return cls._backend.get_stats()
 
     @classmethod
     async def get_session(cls, session_id: str) -> Session | None:
-        return cls._sessions.get(session_id)
+        return await cls._backend.get_session(session_id)
 
     @classmethod
     async def create_session(
-        cls, state: Type[State] | None = None, buffer_size: int = 10
+        cls,
+        state: Type[State] | None = None,
+        buffer_size: int = 10,
+        buffer_max_age: float | None = None,
+        max_components: int | None = None,
+        cache_max_bytes: int | None = 1024 * 1024,
     ) -> Session:
         session_id = str(uuid.uuid4())
-        session = Session(session_id, state, buffer_size=buffer_size)
-
-        async with cls._lock:
-            cls._sessions[session_id] = session
-
+        session = Session(
+            session_id,
+            state,
+            buffer_size=buffer_size,
+            buffer_max_age=buffer_max_age,
+            max_components=max_components,
+            cache_max_bytes=cache_max_bytes,
+        )
+        await cls._backend.save_session(session)
         return session
 
+    @classmethod
+    async def save_session(cls, session: Session) -> None:
+        await cls._backend.save_session(session)
+
     @classmethod
     async def update_session(cls, session_id: str, data: dict) -> None:
         session = await cls.get_session(session_id)
         if session:
-            async with cls._lock:
-                session.set_data(data)
+            session.set_data(data)
+            await cls._backend.save_session(session)
 
     @classmethod
     async def delete_session(cls, session_id: str) -> None:
-        if session_id in cls._sessions:
-            async with cls._lock:
-                del cls._sessions[session_id]
+        await cls._backend.delete_session(session_id)
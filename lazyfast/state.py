@@ -1,12 +1,10 @@
 import asyncio
-from collections import defaultdict
-from typing import Any, Self, dataclass_transform
+import threading
+from typing import Any, Callable, Self, dataclass_transform
 from fastapi import Request
 from pydantic import BaseModel, Field
 from pydantic._internal._model_construction import ModelMetaclass
 
-field_to_components: dict[str, list[str]] = defaultdict(set)
-
 
 class StateField:
     _name: str
@@ -14,14 +12,79 @@ class StateField:
     def __init__(self, name: str):
         self._name = name
 
-    def register_component_reload(self, component_id: str):
-        field_to_components[self._name].add(component_id)
-
     @property
     def name(self) -> str:
         return self._name
 
 
+def _count_mutations(cls: type, method_names: tuple[str, ...]) -> type:
+    def make_method(method):
+        def tracked_method(self, *args, **kwargs):
+            self.version += 1
+            return method(self, *args, **kwargs)
+
+        return tracked_method
+
+    for name in method_names:
+        setattr(cls, name, make_method(getattr(cls.__mro__[1], name)))
+    return cls
+
+
+class TrackedList(list):
+    """List that counts its in-place changes in `version`"""
+
+    version = 0
+
+
+class TrackedDict(dict):
+    """Dict that counts its in-place changes in `version`"""
+
+    version = 0
+
+
+class TrackedSet(set):
+    """Set that counts its in-place changes in `version`"""
+
+    version = 0
+
+
+_count_mutations(
+    TrackedList,
+    (
+        "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+        "__setitem__", "__delitem__", "__iadd__", "__imul__",
+    ),
+)
+_count_mutations(
+    TrackedDict,
+    (
+        "pop", "popitem", "clear", "update", "setdefault",
+        "__setitem__", "__delitem__", "__ior__",
+    ),
+)
+_count_mutations(
+    TrackedSet,
+    (
+        "add", "discard", "remove", "pop", "clear", "update", "difference_update",
+        "intersection_update", "symmetric_difference_update",
+        "__ior__", "__iand__", "__isub__", "__ixor__",
+    ),
+)
+
+_TRACKED_TYPES = {list: TrackedList, dict: TrackedDict, set: TrackedSet}
+
+
+def _track(value: Any) -> Any:
+    if tracked_type := _TRACKED_TYPES.get(type(value)):
+        return tracked_type(value)
+    return value
+
+
+# guards the subscriptions of all states, components subscribe from the worker
+# threads of sync views. Not a private attribute: states stay copyable and comparable
+_subscriptions_lock = threading.Lock()
+
+
 @dataclass_transform(kw_only_default=True, field_specifiers=(Field,))
 class ModelMeta(ModelMetaclass):
     def __getattr__(cls, name):
@@ -31,46 +94,120 @@ class ModelMeta(ModelMetaclass):
 
 
 class State(BaseModel, metaclass=ModelMeta):
+    """Session state.
+
+    Changes are tracked incrementally: assigned fields are recorded by `__setattr__`,
+    and list, dict and set values are wrapped into containers that count their
+    in-place changes. A commit therefore only compares the fields that were touched.
+    Changes inside nested objects (e.g. an item of a list) are not detected, reassign
+    the field or call `mark_changed` for them.
+    """
+
     _queue: asyncio.Queue | None = None
-    _dump: dict[str, Any] = {}
+    _subscriptions: dict[str, set[str]] = {}
+    _originals: dict[str, Any] = {}
+    _versions: dict[str, tuple[Any, int]] = {}
+    _marked: set[str] = set()
+    _change_listeners: list[Callable[[set[str]], None]] = []
 
     @staticmethod
     async def load(request: Request) -> Self:
         return request.state.session.state
 
+    def model_post_init(self, _) -> None:
+        for name in self.__class__.model_fields:
+            self.__dict__[name] = _track(self.__dict__.get(name))
+        self.open()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self.__class__.model_fields:
+            if name not in self._originals:
+                self._originals[name] = self.__dict__.get(name)
+            value = _track(value)
+        super().__setattr__(name, value)
+
     def set_queue(self, queue: asyncio.Queue):
         self._queue = queue
 
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        if private := state.get("__pydantic_private__"):
+            state["__pydantic_private__"] = {**private, "_queue": None}
+        return state
+
+    def subscribe(self, component_id: str, fields: list[str]) -> None:
+        """Reload the component of this session when any of the fields is changed"""
+        with _subscriptions_lock:
+            for field_name in fields:
+                if components := self._subscriptions.get(field_name):
+                    components.add(component_id)
+                else:
+                    self._subscriptions[field_name] = {component_id}
+
+    def unsubscribe(self, component_id: str) -> None:
+        """Stop reloading the component, e.g. when the session releases it"""
+        with _subscriptions_lock:
+            for field_name, components in list(self._subscriptions.items()):
+                components.discard(component_id)
+                if not components:
+                    del self._subscriptions[field_name]
+
+    def add_change_listener(self, listener: Callable[[set[str]], None]) -> None:
+        """Call the listener with the names of changed fields on every commit with changes"""
+        self._change_listeners.append(listener)
+
+    def mark_changed(self, *fields: str) -> None:
+        """Mark fields as changed, e.g. after changing nested objects in place"""
+        self._marked.update(fields)
+
     def dequeue(self) -> Any:
         return self._queue.get()
 
     async def enqueue(self, value: Any) -> None:
         await self._queue.put(value)
 
-    @staticmethod
-    def _compare_dicts(data1: dict[str, Any], data2: dict[str, Any]) -> set[str]:
-        changed_fields = set()
-        all_keys = set(data1.keys()).union(set(data2.keys()))
+    def _get_changed_fields(self) -> set[str]:
+        changed_fields = set(self._marked)
+        values = self.__dict__
 
-        for key in all_keys:
-            if key not in data1 or key not in data2:
-                changed_fields.add(key)
-            elif data1[key] != data2[key]:
-                changed_fields.add(key)
+        for name, original in self._originals.items():
+            if values.get(name) != original:
+                changed_fields.add(name)
+
+        for name, (container, version) in self._versions.items():
+            if values.get(name) is container and container.version != version:
+                changed_fields.add(name)
 
         return changed_fields
 
     async def _reload_related_components(self, fields: set[str]) -> None:
-        for field_name in fields:
-            if components := field_to_components.get(field_name):
-                for component_id in components:
-                    await self.enqueue(component_id)
+        with _subscriptions_lock:
+            component_ids = [
+                component_id
+                for field_name in fields
+                for component_id in self._subscriptions.get(field_name, ())
+            ]
+
+        for component_id in component_ids:
+            await self.enqueue(component_id)
 
     def open(self) -> None:
-        self._dump = self.model_dump()
+        self._originals = {}
+        self._marked = set()
+        self._versions = {
+            name: (value, value.version)
+            for name, value in self.__dict__.items()
+            if isinstance(value, (TrackedList, TrackedDict, TrackedSet))
+        }
 
     async def commit(self) -> None:
-        changed_fields = self._compare_dicts(self._dump, self.model_dump())
+        changed_fields = self._get_changed_fields()
+        self.open()
+
+        if changed_fields:
+            for listener in self._change_listeners:
+                listener(changed_fields)
+
         await self._reload_related_components(changed_fields)
 
     async def __aenter__(self) -> Self:
@@ -79,4 +216,3 @@ class State(BaseModel, metaclass=ModelMeta):
 
     async def __aexit__(self, *_) -> None:
         await self.commit()
-
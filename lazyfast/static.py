@@ -0,0 +1,91 @@
+import os
+import gzip
+import hashlib
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+VENDOR_DIR = os.path.join(os.path.dirname(__file__), "vendor")
+HTMX_VERSION = "2.0.4"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def read_vendored_htmx() -> str:
+    with open(os.path.join(VENDOR_DIR, "htmx.min.js"), encoding="utf-8") as file:
+        return file.read()
+
+
+class StaticAsset:
+    """A file served from a content-hashed URL.
+
+    The content never changes for a given URL, so responses are cached by browsers forever.
+    Compressed variants are built once, when the asset is created.
+
+    Args:
+        name (str): File name without extension
+        content (str): File content
+        extension (str, optional): File extension. Defaults to "js".
+        media_type (str, optional): Content type of the file. Defaults to "text/javascript".
+    """
+
+    def __init__(
+        self,
+        name: str,
+        content: str,
+        extension: str = "js",
+        media_type: str = "text/javascript",
+    ) -> None:
+        self._media_type = media_type
+        body = content.encode()
+
+        self.content_hash = hashlib.sha256(body).hexdigest()[:16]
+        self.filename = f"{name}.{self.content_hash}.{extension}"
+
+        # ordered by preference
+        self._variants: dict[str, bytes] = {}
+        if brotli:
+            self._variants["br"] = brotli.compress(body, quality=11)
+        self._variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        self._variants["identity"] = body
+
+    def _select_encoding(self, accept_encoding: str) -> str:
+        accepted = set()
+        for part in accept_encoding.split(","):
+            coding, _, params = part.strip().partition(";")
+            if params.replace(" ", "") not in ("q=0", "q=0.0"):
+                accepted.add(coding.strip().lower())
+
+        for encoding in self._variants:
+            if encoding in accepted:
+                return encoding
+        return "identity"
+
+    def response(self, request: Request) -> Response:
+        encoding = self._select_encoding(request.headers.get("accept-encoding", ""))
+        etag = (
+            f'"{self.content_hash}"'
+            if encoding == "identity"
+            else f'"{self.content_hash}-{encoding}"'
+        )
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL,
+            "etag": etag,
+            "vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["content-encoding"] = encoding
+
+        return Response(
+            self._variants[encoding], media_type=self._media_type, headers=headers
+        )
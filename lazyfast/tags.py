@@ -1,15 +1,26 @@
 from abc import ABC
-import functools
 import html as html_utils
-from dataclasses import dataclass, field, fields
-from typing import Any, Literal, Type
+from dataclasses import MISSING, dataclass, field, fields
+from types import MemberDescriptorType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    Literal,
+    NamedTuple,
+    Type,
+    TypeVar,
+    dataclass_transform,
+)
 
 from lazyfast import context
 from lazyfast.htmx import HTMX
-from lazyfast.state import StateField
 
 RELOAD_SCRIPT = "reloadComponent(this, event)"
 THROTTELED_RELOAD_SCRIPT = "throttledReloadComponent(this, event)"
+STREAM_CHUNK_PARTS = 512
+
+T = TypeVar("T")
 
 ATTR_RENAME_MAP = {
     "class_": "class",
@@ -27,6 +38,8 @@ FIELDS_TO_EXCLUDE = (
     "_self_closing",
     "allow_unsafe_html",
     "reload_on",
+    "debounce",
+    "throttle",
     "is_indicator",
     "cache",
 )
@@ -87,8 +100,135 @@ __all__ = [
     "raw",
 ]
 
+_ATTR_PLAIN = 0
+_ATTR_DATASET = 1
+_ATTR_HX = 2
+
+
+class _CompiledTag(NamedTuple):
+    tag_name: str
+    # field name -> (position, rendered attribute name, kind)
+    attr_table: dict[str, tuple[int, str, int]]
+    # rendered fields whose class default is not empty, e.g. `form.onsubmit`
+    attr_defaults: dict[str, Any]
+    init_fields: tuple[str, ...]
+    init_defaults: dict[str, Any]
+    event_fields: tuple[str, ...]
+
+
+_compiled_tag_classes: dict[type, _CompiledTag] = {}
+
+
+def _compile_tag_class(cls: type) -> _CompiledTag:
+    """Precompute tag name, rendered attribute names and constructor arguments of a tag class"""
+    attr_table = {}
+    attr_defaults = {}
+    init_defaults = {}
+
+    for position, tag_field in enumerate(fields(cls)):
+        key = tag_field.name
+        if tag_field.init:
+            init_defaults[key] = tag_field.default
+        if key in FIELDS_TO_EXCLUDE:
+            continue
+        if key == "dataset":
+            attr_table[key] = (position, "", _ATTR_DATASET)
+        elif key == "hx":
+            attr_table[key] = (position, "", _ATTR_HX)
+        else:
+            attr_name = ATTR_RENAME_MAP.get(key, key).replace("_", "-")
+            attr_table[key] = (position, attr_name, _ATTR_PLAIN)
+        if tag_field.default is not MISSING and tag_field.default:
+            attr_defaults[key] = tag_field.default
+
+    compiled = _CompiledTag(
+        tag_name=cls.__name__.lower(),
+        attr_table=attr_table,
+        attr_defaults=attr_defaults,
+        init_fields=tuple(init_defaults),
+        init_defaults=init_defaults,
+        event_fields=tuple(key for key in attr_table if key.startswith("on")),
+    )
+    _compiled_tag_classes[cls] = compiled
+    return compiled
+
+
+def _attr_position(item: tuple[tuple[int, str, int], Any]) -> int:
+    return item[0][0]
+
+
+def _get_compiled_tag_class(cls: type) -> _CompiledTag:
+    if compiled := _compiled_tag_classes.get(cls):
+        return compiled
+    return _compile_tag_class(cls)
+
+
+def _bind_positional_args(
+    cls: type, compiled: _CompiledTag, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> None:
+    if len(args) > len(compiled.init_fields):
+        raise TypeError(
+            f"{cls.__name__}.__init__() takes {len(compiled.init_fields) + 1} "
+            f"positional arguments but {len(args) + 1} were given"
+        )
+    for key, value in zip(compiled.init_fields, args):
+        if key in kwargs:
+            raise TypeError(
+                f"{cls.__name__}.__init__() got multiple values for argument '{key}'"
+            )
+        kwargs[key] = value
+
+
+class _AttrField:
+    """Field of a tag stored in the `_attrs` mapping of the instance.
 
-@dataclass(slots=True)
+    Unset fields are not stored at all, reading them returns the field default.
+    """
+
+    __slots__ = ("name", "default")
+
+    def __init__(self, name: str, default: Any) -> None:
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj: Any, cls: type | None = None) -> Any:
+        if obj is None:
+            return self.default
+        return obj._attrs.get(self.name, self.default)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        try:
+            attrs = obj._attrs
+        except AttributeError:  # generated __init__ of a custom @dataclass tag
+            attrs = obj._attrs = {}
+        if value is not self.default or self.name in attrs:
+            attrs[self.name] = value
+
+
+@dataclass_transform(field_specifiers=(field,))
+def element(cls: type[T]) -> type[T]:
+    """Declare a tag class, used like `@dataclass`.
+
+    Instances only keep the attributes that were set, in one small mapping, and their
+    children. Unset attributes cost nothing, which matters for large trees.
+    """
+    cls = dataclass(cls, init=False)
+
+    # like @dataclass(slots=True), re-create the class without instance __dict__
+    namespace = dict(cls.__dict__)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    own_fields = cls.__dict__.get("__annotations__", {})
+    for tag_field in fields(cls):
+        namespace.pop(tag_field.name, None)
+        if tag_field.name in own_fields and tag_field.name != "_children":
+            namespace[tag_field.name] = _AttrField(tag_field.name, tag_field.default)
+    namespace["__slots__"] = () if hasattr(cls, "_attrs") else ("_attrs", "_children")
+
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@element
 class BaseHTML(ABC):
     content: str | None = None
     allow_unsafe_html: bool = False
@@ -96,6 +236,27 @@ class BaseHTML(ABC):
     _self_closing: bool = field(default=False, init=False)
     _children: list[Type["Tag"]] = field(default_factory=list)
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        compiled = _get_compiled_tag_class(self.__class__)
+
+        # the usual calls are tags.div(...) and tags.div("text", ...)
+        if len(args) == 1 and "content" not in kwargs:
+            kwargs["content"] = args[0]
+        elif args:
+            _bind_positional_args(self.__class__, compiled, args, kwargs)
+
+        children = kwargs.pop("_children", None)
+        if not kwargs.keys() <= compiled.init_defaults.keys():
+            key = next(key for key in kwargs if key not in compiled.init_defaults)
+            raise TypeError(
+                f"{self.__class__.__name__}.__init__() got an unexpected keyword argument '{key}'"
+            )
+
+        # only the passed arguments are stored, the rest is read from field defaults
+        self._attrs = kwargs
+        self._children = [] if children is None else children
+        self.__post_init__()
+
     @property
     def tag_name(self) -> str:
         return self.__class__.__name__.lower()
@@ -110,58 +271,131 @@ class BaseHTML(ABC):
     def clear_children(self):
         self._children = []
 
-    @staticmethod
-    def _build_attr_str_repr(
-        key: str, value: Any, replace_underscore: bool = True
-    ) -> str:
-        attr_name = ATTR_RENAME_MAP.get(key, key)
-        if replace_underscore:
-            attr_name = attr_name.replace("_", "-")
-        if isinstance(value, bool):
-            return f"{attr_name} "
-        else:
-            return f'{attr_name}="{value}" '
+    def __init_subclass__(cls, **kwargs):
+        super(BaseHTML, cls).__init_subclass__(**kwargs)
+        # @element and @dataclass re-create the class, only the final one owns its fields
+        if "__dataclass_fields__" in cls.__dict__:
+            # custom tags declared with @dataclass(slots=True) get a slot for every field,
+            # values are kept in `_attrs` all the same
+            for tag_field in fields(cls):
+                if isinstance(cls.__dict__.get(tag_field.name), MemberDescriptorType):
+                    setattr(cls, tag_field.name, _AttrField(tag_field.name, tag_field.default))
+            _compile_tag_class(cls)
 
     def _get_attrs(self) -> str:
-        attrs = ""
-        for key in getattr(self, "__dataclass_fields__", []):
-            if key in FIELDS_TO_EXCLUDE:
-                continue
-            if value := getattr(self, key):
-                if key == "dataset":
-                    for data_key, data_value in value.items():
-                        attrs += self._build_attr_str_repr(
-                            "data-" + data_key, data_value, replace_underscore=False
-                        )
-                elif key == "hx":
-                    for hx_key, hx_value in value.attrs:
-                        if hx_value:
-                            attrs += self._build_attr_str_repr(hx_key, hx_value)
+        compiled = _get_compiled_tag_class(self.__class__)
+        attr_table = compiled.attr_table
+        values = self._attrs
+        if compiled.attr_defaults:
+            values = {**compiled.attr_defaults, **values}
+
+        # set attributes are rendered in the order the fields are declared
+        items = [
+            (attr_table[key], value)
+            for key, value in values.items()
+            if value and key in attr_table
+        ]
+        if len(items) > 1:
+            items.sort(key=_attr_position)
+
+        attrs = []
+        for (_, attr_name, kind), value in items:
+            if kind == _ATTR_PLAIN:
+                if value is True:
+                    attrs.append(attr_name)
                 else:
-                    attrs += self._build_attr_str_repr(key, value)
-        return attrs.strip()
+                    attrs.append(f'{attr_name}="{value}"')
+            elif kind == _ATTR_DATASET:
+                for data_key, data_value in value.items():
+                    if isinstance(data_value, bool):
+                        attrs.append(f"data-{data_key}")
+                    else:
+                        attrs.append(f'data-{data_key}="{data_value}"')
+            else:
+                for hx_key, hx_value in value.attrs:
+                    if hx_value:
+                        if hx_value is True:
+                            attrs.append(hx_key)
+                        else:
+                            attrs.append(f'{hx_key}="{hx_value}"')
+
+        return " ".join(attrs).strip()
 
     def _build_content(self) -> str:
-        return "".join([tag.html() for tag in self._children])
+        out = []
+        for tag in self._children:
+            tag._render(out)
+        return "".join(out)
+
+    def _render_open(self, tag_name: str, out: list[str]) -> None:
+        if attrs := self._get_attrs():
+            out.append(f"<{tag_name} {attrs}>")
+        else:
+            out.append(f"<{tag_name}>")
 
-    def html(self) -> str:
-        attrs = self._get_attrs()
-        if attrs:
-            attrs = " " + attrs
+    def _render(self, out: list[str]) -> None:
+        tag_name = _get_compiled_tag_class(self.__class__)[0]
 
         if self._self_closing:
-            return f"<{self.tag_name}{attrs} />"
-        elif self.content:
+            if attrs := self._get_attrs():
+                out.append(f"<{tag_name} {attrs} />")
+            else:
+                out.append(f"<{tag_name} />")
+            return
+
+        is_raw = tag_name == "raw"
+
+        if not is_raw:
+            self._render_open(tag_name, out)
+
+        if self.content:
             if self.allow_unsafe_html:
-                content = self.content
+                out.append(str(self.content))
             else:
-                content = html_utils.escape(str(self.content), quote=True)
+                out.append(html_utils.escape(str(self.content), quote=True))
         else:
-            content = self._build_content()
+            for tag in self._children:
+                tag._render(out)
+
+        if not is_raw:
+            out.append(f"</{tag_name}>")
+
+    def _iter_render(self, out: list[str]) -> Iterator[str]:
+        if self._self_closing or self.content or not self._children:
+            self._render(out)
+            return
+
+        tag_name = _get_compiled_tag_class(self.__class__)[0]
+        is_raw = tag_name == "raw"
+
+        if not is_raw:
+            self._render_open(tag_name, out)
+
+        for tag in self._children:
+            yield from tag._iter_render(out)
+
+            if len(out) >= STREAM_CHUNK_PARTS:
+                yield "".join(out)
+                out.clear()
 
-        if self.tag_name == "raw":
-            return content
-        return f"<{self.tag_name}{attrs}>{content}</{self.tag_name}>"
+        if not is_raw:
+            out.append(f"</{tag_name}>")
+
+    def html(self) -> str:
+        out = []
+        self._render(out)
+        return "".join(out)
+
+    def iter_html(self) -> Iterator[str]:
+        """Serialize the tag as a sequence of chunks.
+
+        Joined together, the chunks are equal to `html()`. Subtrees are flushed
+        as soon as roughly `STREAM_CHUNK_PARTS` pieces have been rendered.
+        """
+        out = []
+        yield from self._iter_render(out)
+        if out:
+            yield "".join(out)
 
     def __enter__(self):
         if self._self_closing:
@@ -170,27 +404,26 @@ class BaseHTML(ABC):
             raise TypeError(
                 'You cannot use "with" operator and "content" field at the same time'
             )
-        context.append_tag_to_stack(self)
+        context.get_render_context().tag_stack.append(self)
         return self
 
     def __exit__(self, *_):
         context.pop_last_tag_from_stack()
 
     def __post_init__(self):
-        if parent_tag := context.get_last_tag_from_stack():
-            parent_tag.add_child(self)
-            context.update_last_tag_in_stack(parent_tag)
-
+        ctx = context.get_render_context()
+        if ctx.tag_stack:
+            ctx.tag_stack[-1].add_child(self)
         else:
-            context.add_root_tag(self)
+            ctx.add_root_tag(self)
 
 
-@dataclass(slots=True)
+@element
 class raw(BaseHTML):
     allow_unsafe_html: bool = True
 
 
-@dataclass(slots=True)
+@element
 class Tag(BaseHTML):
     id: str | None = None
     class_: str | None = None
@@ -240,6 +473,8 @@ class Tag(BaseHTML):
 
     hx: Type[HTMX] | None = None
     reload_on: list[str] | None = None
+    debounce: int | None = None
+    throttle: int | None = None
     is_indicator: bool = False
 
     # TODO xml:_lang
@@ -260,22 +495,39 @@ class Tag(BaseHTML):
         if not self.id:
             raise ValueError("Trigger checking requires tag id")
 
-        session = context.get_session()
+        reload_request = context.get_reload_request()
 
-        if tid := session.reload_request.trigger_id:
+        if tid := reload_request.trigger_id:
             if tid == self.id:
-                return session.reload_request.trigger_event
+                return reload_request.trigger_event
 
     def _reset_events(self):
-        for tag_field in fields(self):
-            if tag_field.name.startswith("on"):
-                setattr(self, tag_field.name, None)
+        for event in _get_compiled_tag_class(self.__class__).event_fields:
+            setattr(self, event, None)
+
+    def _set_reload_limit(self):
+        """Render the reload rate limit of the element, the client keeps a limiter per element"""
+        if self.debounce is not None and self.throttle is not None:
+            raise ValueError("debounce and throttle can't be used together")
+
+        if self.debounce is not None:
+            limit = {"reload-debounce": self.debounce}
+        else:
+            limit = {"reload-throttle": self.throttle}
+        self.dataset = {**(self.dataset or {}), **limit}
+
+        for event in _get_compiled_tag_class(self.__class__).event_fields:
+            if getattr(self, event) == RELOAD_SCRIPT:
+                setattr(self, event, THROTTELED_RELOAD_SCRIPT)
 
     def __post_init__(self):
-        if self.is_indicator:
+        # these fields default to empty values, unset ones are not in `_attrs`
+        attrs = self._attrs
+
+        if attrs.get("is_indicator"):
             self.class_ += " htmx-indicator"
 
-        if self.reload_on:
+        if attrs.get("reload_on"):
             self._reset_events()
 
             for event in self.reload_on:
@@ -292,536 +544,43 @@ class Tag(BaseHTML):
                     value = RELOAD_SCRIPT
                 setattr(self, event, value)
 
-        if parent_tag := context.get_last_tag_from_stack():
-            parent_tag.add_child(self)
-            context.update_last_tag_in_stack(parent_tag)
+        if attrs.get("debounce") is not None or attrs.get("throttle") is not None:
+            self._set_reload_limit()
 
+        ctx = context.get_render_context()
+        if ctx.tag_stack:
+            ctx.tag_stack[-1].add_child(self)
         else:
-            context.add_root_tag(self)
+            ctx.add_root_tag(self)
 
-        for tag in context.get_all_tags_from_stack():
+        for tag in ctx.tag_stack:
             if tag.tag_name == "form" and self.tag_name != "button":
                 self._reset_events()
                 break
 
 
-@dataclass(slots=True)
-class div(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class span(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class p(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class b(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class ul(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class ol(Tag):
-    reversed_: bool | None = None
-    start: int | None = None
-    type_: str | None = None
-
-
-@dataclass(slots=True)
-class li(Tag):
-    value: int | None = None
-
-
-@dataclass(slots=True)
-class h1(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class h2(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class h3(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class h4(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class h5(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class h6(Tag):
-    pass
-
-
-_referrerpolicy = Literal[
-    "no-referrer",
-    "no-referrer-when-downgrade",
-    "same-origin",
-    "origin",
-    "origin-when-cross-origin",
-    "unsafe-url",
-]
-
-
-@dataclass(slots=True)
-class a(Tag):
-    href: str | None = None
-    rel: str | None = None
-    type_: str | None = None
-    crossorigin: Literal["anonymous", "use-credentials"] | None = None
-    integrity: str | None = None
-    referrerpolicy: _referrerpolicy | None = None
-    download: bool | None = None
-
-
-@dataclass(slots=True)
-class caption(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class colgroup(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class col(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class table(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class thead(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class tbody(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class tfoot(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class tr(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class th(Tag):
-    abbr: str | None = None
-    colspan: int | None = None
-    rowspan: int | None = None
-    headers: str | None = None
-    scope: Literal["col", "colgroup", "row", "rowgroup"] | None = None
-
-
-@dataclass(slots=True)
-class td(Tag):
-    colspan: int | None = None
-    rowspan: int | None = None
-    headers: str | None = None
-
-
-_referrerpolicy = Literal[
-    "no-referrer",
-    "no-referrer-when-downgrade",
-    "same-origin",
-    "origin",
-    "origin-when-cross-origin",
-    "unsafe-url",
-]
-
-
-@dataclass(slots=True)
-class script(Tag):
-    src: str | None = None
-    type: str | None = None
-    async_: bool | None = None
-    defer: bool | None = None
-    integrity: str | None = None
-    nonce: str | None = None
-    referrerpolicy: _referrerpolicy | None = None  # type: ignore
-    crossorigin: Literal["anonymous", "use-credentials"] | None = None
-    integrity: str | None = None
-    referrerpolicy: _referrerpolicy | None = None  # type: ignore
-
-    allow_unsafe_html: bool | None = True
-
-
-@dataclass(slots=True)
-class style(Tag):
-    src: str | None = None
-    type: str | None = None
-
-    allow_unsafe_html: bool | None = True
-
-
-@dataclass(slots=True)
-class link(Tag):
-    href: str | None = None
-    rel: str | None = None
-    type: str | None = None
-    crossorigin: Literal["anonymous", "use-credentials"] | None = None
-    integrity: str | None = None
-    referrerpolicy: _referrerpolicy | None = None  # type: ignore
-
-
-@dataclass(slots=True)
-class meta(Tag):
-    _self_closing = True
-
-    name: str | None = None
-    content_: str | None = None
-    charset: str | None = None
-    http_equiv: str | None = None
-    scheme: str | None = None
-
-
-@dataclass(slots=True)
-class html(Tag):
-    lang: str | None = None
-
-
-@dataclass(slots=True)
-class body(Tag):
-    lang: str | None = None
-
-
-@dataclass(slots=True)
-class head(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class header(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class footer(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class title(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class nav(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class section(Tag):
-    pass
-
-
-_enctype = Literal[
-    "application/x-www-form-urlencoded", "multipart/form-data", "text/plain"
-]
-
-
-@dataclass(slots=True)
-class form(Tag):
-    pass
-    # accept_charset: str | None = None
-    # action: str | None = None
-    # # TODO: autocomplete attribute
-    # enctype: _enctype | None = None
-    # method: Literal["get", "post"] | None = None
-    # name: str | None = None
-    # # TODO: novalidate attribute
-    # target: Literal["_self", "_blank", "_parent", "_top"] | None = None
-
-    # onreset: Callable | None = None
-    # onselect: Callable | None = None
-    onsubmit: str | None = "preventFormSubmission(event)"
-
-
-_input_type = Literal[
-    "button",
-    "checkbox",
-    "color",
-    "date",
-    "datetime-local",
-    "email",
-    "file",
-    "hidden",
-    "image",
-    "month",
-    "number",
-    "password",
-    "radio",
-    "range",
-    "reset",
-    "search",
-    "submit",
-    "tel",
-    "text",
-    "time",
-    "url",
-    "week",
-]
-
-
-@dataclass(slots=True)
-class input(Tag):
-    _self_closing = True
-
-    type_: _input_type | None = None
-    accept: str | None = None
-    checked: bool | None = None
-    disabled: bool | None = None
-    maxlength: int | None = None
-    name: str | None = None
-    readonly: bool | None = None
-    required: bool | None = None
-    value: str | None = None
-    placeholder: str | None = None
-    list: str | None = None
-    multiple: bool | None = None
-    min: str | None = None
-    max: str | None = None
-    step: str | None = None
-
-    onchange: str | None = THROTTELED_RELOAD_SCRIPT
-    oninput: str | None = None
-
-    def __post_init__(self):
-        if self.value and not self.name:
-            raise ValueError("Name attribute is required if value is set")
-
-        session = context.get_session()
-        inputs = session.reload_request.data
-
-        self.value = inputs.get(self.name, self.value)
-
-        if self.type_ == "checkbox":
-            self.checked = bool(self.value)
-
-        super(input, self).__post_init__()
-
-
-@dataclass(slots=True)
-class button(Tag):
-    disabled: bool | None = None
-    name: str | None = None
-    type_: Literal["submit", "reset", "button"] | None = None
-    value: str | None = None
-    onclick: str | None = RELOAD_SCRIPT
-
-    def __post_init__(self):
-        if self.popovertarget:
-            self.onclick = None
-        super(button, self).__post_init__()
-
-
-@dataclass(slots=True)
-class label(Tag):
-    for_: str | None = None
-
-
-@dataclass(slots=True)
-class select(Tag):
-    autofocus: bool | None = None
-    disabled: bool | None = None
-    multiple: bool | None = None
-    name: str | None = None
-    required: bool | None = None
-    size: int | None = None
-
-    onchange: str | None = RELOAD_SCRIPT
-    oninput: str | None = None
-
-    def __post_init__(self):
-        if self.value and not self.name:
-            raise ValueError("Name attribute is required if value is set")
-        super(select, self).__post_init__()
-
-    @property
-    def value(self) -> Any:
-        if not self.name:
-            raise ValueError("Name attribute is required for getting value")
-        session = context.get_session()
-        inputs = session.reload_request.data
-        return inputs.get(self.name)
-
-
-@dataclass(slots=True)
-class textarea(Tag):
-    name: str | None = None
-    placeholder: str | None = None
-    required: bool | None = None
-    autofocus: bool | None = None
-    cols: int | None = None
-    rows: int | None = None
-    disabled: bool | None = None
-    maxlength: int | None = None
-    readonly: bool | None = None
-    dirname: str | None = None
-    form: str | None = None
-    wrap: Literal["hard", "soft"] | None = None
-    oninput: str | None = RELOAD_SCRIPT
-
-    def __post_init__(self):
-        session = context.get_session()
-        inputs = session.reload_request.data
-        self.content = inputs.get(self.name, self.content)
-        super(textarea, self).__post_init__()
-
-
-@dataclass(slots=True)
-class option(Tag):
-    disabled: bool | None = None
-    label: str | None = None
-    selected: bool | None = None
-    value: str | None = None
-
-
-@dataclass(slots=True)
-class optgroup(Tag):
-    disabled: bool | None = None
-    label: str | None = None
-
-
-@dataclass(slots=True)
-class i(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class article(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class img(Tag):
-    src: str | None = None
-    alt: str | None = None
-    width: int | None = None
-    height: int | None = None
-    crossorigin: Literal["anonymous", "use-credentials"] | None = None
-    loading: Literal["eager", "lazy"] | None = None
-
-
-@dataclass(slots=True)
-class data(Tag):
-    value: str | None = None
-
-
-@dataclass(slots=True)
-class datalist(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class dialog(Tag):
-    open: bool | None = None
-
-
-@dataclass(slots=True)
-class dl(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class dt(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class em(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class blockquote(Tag):
-    cite: str | None = None
-
-
-@dataclass(slots=True)
-class strong(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class canvas(Tag):
-    width: int | None = None
-    height: int | None = None
-
-
-@dataclass(slots=True)
-class small(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class br(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class aside(Tag):
-    pass
-
-
-@dataclass(slots=True)
-class details(Tag):
-    open: bool | None = None
-
-
-@dataclass(slots=True)
-class embed(Tag):
-    src: str | None = None
-    type: str | None = None
-    width: int | None = None
-    height: int | None = None
-
+# element classes are imported on the first access, see elements.py.
+# Type checkers and IDEs see them as if they were defined here
+if TYPE_CHECKING:
+    from lazyfast.elements import *
 
-@dataclass(slots=True)
-class progress(Tag):
-    max: int | None = None
-    value: int | None = None
 
+def __getattr__(name: str) -> Any:
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@dataclass(slots=True)
-class hr(Tag):
-    pass
+    from lazyfast import elements
 
+    module_globals = globals()
+    for key, value in vars(elements).items():
+        if isinstance(value, type) and issubclass(value, Tag):
+            module_globals.setdefault(key, value)
 
-@dataclass(slots=True)
-class pre(Tag):
-    pass
+    if name not in module_globals:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return module_globals[name]
 
 
-@dataclass(slots=True)
-class code(Tag):
-    pass
+def __dir__() -> list[str]:
+    __getattr__("div")
+    return sorted(globals())
@@ -4,11 +4,9 @@ import hmac
 import json
 import base64
 import hashlib
+import threading
 from typing import Callable
 
-import configparser
-import http.client
-
 from urllib.parse import urlencode
 
 
@@ -61,31 +59,64 @@ def get_function_id(func: Callable) -> str:
     return hashlib.md5(unique_string.encode()).hexdigest()
 
 
-def check_library_version():
-    def print_in_frame(text: str):
-        text_length = len(text)
-        border = "+" + "-" * (text_length + 2) + "+"
-        print(border)
-        print(f"| {text} |")
-        print(border)
+_version_check_lock = threading.Lock()
+_version_check_thread: threading.Thread | None = None
+
+
+def _print_in_frame(text: str):
+    text_length = len(text)
+    border = "+" + "-" * (text_length + 2) + "+"
+    print(border)
+    print(f"| {text} |")
+    print(border)
+
+
+def _compare_with_pypi_version(name: str, timeout: float):
+    from importlib import metadata
+    import http.client
+
+    try:
+        current_version = metadata.version(name)
+        conn = http.client.HTTPSConnection("pypi.org", timeout=timeout)
+        try:
+            conn.request("GET", f"/pypi/{name}/json")
+            response = conn.getresponse()
+            if response.status != 200:
+                return
+            pypi_version = json.loads(response.read())["info"]["version"]
+        finally:
+            conn.close()
+    except Exception:
+        return
+
+    if pypi_version != current_version:
+        _print_in_frame(
+            f"LazyFast | new version available: ({current_version} -> {pypi_version})."
+        )
+
 
-    config = configparser.ConfigParser()
-    config.read("pyproject.toml")
+def check_library_version(timeout: float = 3) -> threading.Thread:
+    """Check for a newer LazyFast release on PyPI in a daemon thread.
 
-    name = config["tool.poetry"]["name"].strip('"')
-    current_version = config["tool.poetry"]["version"].strip('"')
+    The check runs once per process and prints a notice if the installed version is outdated.
+    Network errors are ignored.
 
-    conn = http.client.HTTPSConnection("pypi.org")
-    conn.request("GET", f"/pypi/{name}/json")
-    response = conn.getresponse()
+    Args:
+        timeout (float, optional): Timeout of the PyPI request in seconds. Defaults to 3.
 
-    if response.status == 200:
-        data = json.loads(response.read())
-        pypi_version = data["info"]["version"]
+    Returns:
+        threading.Thread: The thread running the check
+    """
+    global _version_check_thread
 
-        if pypi_version != current_version:
-            print_in_frame(
-                f"LazyFast | new version available: ({current_version} -> {pypi_version})."
+    with _version_check_lock:
+        if _version_check_thread is None:
+            _version_check_thread = threading.Thread(
+                target=_compare_with_pypi_version,
+                args=("lazyfast", timeout),
+                name="lazyfast-version-check",
+                daemon=True,
             )
+            _version_check_thread.start()
 
-check_library_version()
+    return _version_check_thread
@@ -0,0 +1,56 @@
+import asyncio
+import re
+
+import httpx
+from fastapi import FastAPI
+
+from lazyfast import Component, LazyFastRouter, tags
+
+router = LazyFastRouter(session_max_components=5)
+
+
+@router.component()
+class A(Component):
+    async def view(self):
+        tags.p("a")
+
+
+@router.component()
+class B(Component):
+    async def view(self):
+        tags.p("b")
+
+
+@router.page("/")
+def index():
+    A()
+
+
+@router.page("/b")
+def page_b():
+    for _ in range(5):
+        B()
+
+
+def test_evicted_component_id_is_not_reused():
+    app = FastAPI()
+    app.include_router(router)
+
+    async def main():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            page = (await client.get("/")).text
+            url = re.search(r'hx-post="([^"]*/A\?[^"]+)"', page).group(1)
+            csrf = re.search(r'value="([0-9a-f]{64})"', page).group(1)
+
+            # released instances free their memory for the new ones
+            ids = set()
+            for _ in range(10):
+                ids.update(re.findall(r"__cid__=(\w+)", (await client.get("/b")).text))
+            assert len(ids) == 50
+
+            response = await client.post(url.replace("&amp;", "&"), data={"csrf": csrf})
+            assert response.status_code == 410
+
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+import asyncio
+import re
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+
+from lazyfast import BaseState, Component, LazyFastRouter, ReloadRequest, context, tags
+from lazyfast.session import Session, SessionStorage
+
+
+class State(BaseState):
+    query: str = ""
+
+
+router = LazyFastRouter(state_schema=State, sse_push_html=True)
+pushed_inputs = []
+
+
+@router.component(id="search", reload_on=[State.query])
+class Search(Component):
+    async def view(
+        self,
+        state: State = Depends(State.load),
+        request: ReloadRequest = Depends(),
+    ):
+        query = request.inputs.get("q", "")
+        if request.method == "POST" and query != state.query:
+            async with state:
+                state.query = query
+            # what an SSE push of this component, triggered by the commit, renders with
+            pushed_inputs.append(dict(self._last_inputs))
+
+        tags.input(name="q", value=query)
+        tags.p(f"results for {state.query}")
+
+
+@router.page("/")
+def index():
+    Search()
+
+
+def test_push_after_a_commit_uses_the_inputs_of_the_current_request():
+    app = FastAPI()
+    app.include_router(router)
+
+    async def main():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            page = (await client.get("/")).text
+            url = re.search(r'hx-post="([^"]+)"', page).group(1).replace("&amp;", "&")
+            csrf = re.search(r'value="([0-9a-f]{64})"', page).group(1)
+
+            for query in ("hello", "typed"):
+                response = await client.post(url, data={"csrf": csrf, "q": query})
+                assert f"results for {query}" in response.text
+
+            session = await SessionStorage.get_session(client.cookies["sid"])
+            assert session.find_component("search")._last_inputs["q"] == "typed"
+
+    asyncio.run(main())
+    assert [inputs["q"] for inputs in pushed_inputs] == ["hello", "typed"]
+
+
+router_with_preview = LazyFastRouter(state_schema=State, sse_push_html=True)
+preview_pushed = None
+
+
+@router_with_preview.component(id="editor")
+class Editor(Component):
+    async def view(
+        self,
+        state: State = Depends(State.load),
+        request: ReloadRequest = Depends(),
+    ):
+        if request.method == "POST":
+            async with state:
+                state.query = request.inputs["q"]
+            # the preview is pushed over SSE while this view is still rendering
+            await preview_pushed.wait()
+
+        tags.input(name="q")
+
+
+@router_with_preview.component(id="preview", reload_on=[State.query])
+class Preview(Component):
+    async def view(self, state: State = Depends(State.load)):
+        tags.input(name="q")
+        tags.p(f"preview of {state.query}")
+
+
+@router_with_preview.page("/")
+def editor_page():
+    Editor()
+    Preview()
+
+
+async def push_updates(app: FastAPI, session: Session) -> list[tuple[str, str]]:
+    """What the SSE stream of the session does for the next state change"""
+    context.set_session(session)
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/__lazyfast__/sse",
+            "headers": [],
+            "query_string": b"",
+            "app": app,
+            "state": {"session": session},
+        }
+    )
+    container_ids = await session.get_updated_component_ids()
+    rendered, _ = await router_with_preview._render_updated_components(
+        request, session, container_ids
+    )
+    preview_pushed.set()
+    return rendered
+
+
+def test_push_during_a_render_keeps_the_inputs_of_the_rendering_request():
+    app = FastAPI()
+    app.include_router(router_with_preview)
+
+    async def main():
+        global preview_pushed
+        preview_pushed = asyncio.Event()
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            page = (await client.get("/")).text
+            urls = {
+                name: re.search(rf'hx-post="([^"]*/{name}\?[^"]+)"', page)
+                .group(1)
+                .replace("&amp;", "&")
+                for name in ("Editor", "Preview")
+            }
+            csrf = re.search(r'value="([0-9a-f]{64})"', page).group(1)
+            session = await SessionStorage.get_session(client.cookies["sid"])
+
+            await client.post(urls["Preview"], data={"csrf": csrf, "q": "from_preview"})
+
+            push = asyncio.ensure_future(push_updates(app, session))
+            response = await client.post(
+                urls["Editor"], data={"csrf": csrf, "q": "typed_in_editor"}
+            )
+
+            assert 'value="typed_in_editor"' in response.text
+            [(container_id, html)] = await push
+            assert container_id == "preview"
+            assert 'value="from_preview"' in html
+            assert "preview of typed_in_editor" in html
+
+    asyncio.run(main())
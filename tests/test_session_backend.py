@@ -0,0 +1,170 @@
+import asyncio
+import time
+
+from lazyfast import BaseState, Component, LazyFastRouter, context, tags
+from lazyfast.session import (
+    InMemoryKeyValueStore,
+    InMemorySessionBackend,
+    KeyValueSessionBackend,
+    Session,
+)
+
+
+class State(BaseState):
+    count: int = 0
+
+
+router = LazyFastRouter(state_schema=State)
+
+
+@router.component(id="counter", reload_on=[State.count])
+class Counter(Component):
+    title: str
+
+    async def view(self):
+        tags.p(self.title)
+
+
+class CountingStore(InMemoryKeyValueStore):
+    """In-memory store that counts the requests it gets"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gets = 0
+
+    async def get(self, key: str) -> bytes | None:
+        self.gets += 1
+        return await super().get(key)
+
+
+def create_session() -> tuple[Session, Counter]:
+    session = Session("session-1", State(count=3))
+    context.set_session(session)
+    component = Counter(title="hello")
+    return session, component
+
+
+def test_round_trip_keeps_state_and_components():
+    async def main():
+        store = InMemoryKeyValueStore()
+        session, component = create_session()
+        await KeyValueSessionBackend(store).save_session(session)
+
+        # another worker, with an empty local cache
+        loaded = await KeyValueSessionBackend(store).get_session(session.id)
+
+        assert loaded is not session
+        assert loaded.id == session.id
+        assert loaded.csrf_token == session.csrf_token
+        assert loaded.state.count == 3
+
+        restored = loaded.get_component(component.component_id)
+        assert isinstance(restored, Counter)
+        assert restored.title == "hello"
+        assert restored.container_id == "counter"
+        assert loaded.find_component("counter") is restored
+
+        # the restored state is wired to the queue of the restored session
+        loaded.state.count = 4
+        await loaded.state.commit()
+        assert await loaded.get_updated_component_ids() == ["counter"]
+
+    asyncio.run(main())
+
+
+def test_cached_session_is_reused_while_its_version_is_unchanged():
+    async def main():
+        store = CountingStore()
+        session, _ = create_session()
+        backend = KeyValueSessionBackend(store)
+        await backend.save_session(session)
+
+        store.gets = 0
+        assert await backend.get_session(session.id) is session
+        # only the version key is read
+        assert store.gets == 1
+
+    asyncio.run(main())
+
+
+def test_cached_session_is_reloaded_after_another_writer():
+    async def main():
+        store = InMemoryKeyValueStore()
+        session, _ = create_session()
+        backend = KeyValueSessionBackend(store)
+        other_worker = KeyValueSessionBackend(store)
+        await backend.save_session(session)
+
+        other = await other_worker.get_session(session.id)
+        other.state.count = 10
+        await other_worker.save_session(other)
+
+        loaded = await backend.get_session(session.id)
+        assert loaded is not session
+        assert loaded.state.count == 10
+
+    asyncio.run(main())
+
+
+def test_delete_removes_the_session_from_the_store_and_the_cache():
+    async def main():
+        store = InMemoryKeyValueStore()
+        session, _ = create_session()
+        backend = KeyValueSessionBackend(store)
+        other_worker = KeyValueSessionBackend(store)
+        await backend.save_session(session)
+        assert await other_worker.get_session(session.id)
+
+        await backend.delete_session(session.id)
+
+        assert await backend.get_session(session.id) is None
+        assert await other_worker.get_session(session.id) is None
+        assert store._data == {}
+
+    asyncio.run(main())
+
+
+def test_cache_ttl_skips_the_store_until_it_expires():
+    async def main():
+        store = CountingStore()
+        session, _ = create_session()
+        backend = KeyValueSessionBackend(store, cache_ttl=0.2)
+        other_worker = KeyValueSessionBackend(store)
+        await backend.save_session(session)
+
+        other = await other_worker.get_session(session.id)
+        other.state.count = 10
+        await other_worker.save_session(other)
+
+        # within the ttl the cached session is used without any store request
+        store.gets = 0
+        assert await backend.get_session(session.id) is session
+        assert store.gets == 0
+
+        time.sleep(0.25)
+        loaded = await backend.get_session(session.id)
+        assert loaded.state.count == 10
+
+    asyncio.run(main())
+
+
+def test_session_with_an_open_stream_does_not_expire():
+    async def main():
+        backend = InMemorySessionBackend(ttl=0.1)
+        live, _ = create_session()
+        idle = Session("session-2")
+        # the live session is the least recently used one
+        await backend.save_session(live)
+        await backend.save_session(idle)
+
+        live.stream_opened()
+        time.sleep(0.15)
+        assert backend.sweep() == 1
+        assert await backend.get_session(live.id) is live
+        assert await backend.get_session(idle.id) is None
+
+        live.stream_closed()
+        time.sleep(0.15)
+        assert await backend.get_session(live.id) is None
+
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+import copy
+import pickle
+
+from lazyfast import BaseState
+
+
+class State(BaseState):
+    count: int = 0
+    items: list[str] = []
+
+
+def test_state_can_be_copied_and_compared():
+    state = State(count=1, items=["a"])
+    state.subscribe("counter", ["count"])
+
+    assert State() == State()
+    assert copy.deepcopy(state) == state
+    assert state.model_copy(deep=True) == state
+    assert pickle.loads(pickle.dumps(state)) == state
+
+    copied = copy.deepcopy(state)
+    copied.unsubscribe("counter")
+    assert state._subscriptions == {"count": {"counter"}}
@@ -0,0 +1,74 @@
+import asyncio
+
+from lazyfast import BaseState, Component, LazyFastRouter, context
+from lazyfast.session import Session
+
+
+class State(BaseState):
+    count: int = 0
+    title: str = ""
+
+
+router = LazyFastRouter(state_schema=State)
+
+
+@router.component(id="counter", reload_on=[State.count])
+class Counter(Component):
+    async def view(self):
+        pass
+
+
+@router.component(id="counter", reload_on=[State.title])
+class Title(Component):
+    async def view(self):
+        pass
+
+
+@router.component()
+class Plain(Component):
+    async def view(self):
+        pass
+
+
+async def commit(session: Session, **values) -> list[str]:
+    async with session.state:
+        for name, value in values.items():
+            setattr(session.state, name, value)
+
+    if session._queue.empty():
+        return []
+    return await session.get_updated_component_ids()
+
+
+def test_evicted_component_is_unsubscribed():
+    async def main():
+        session = Session("session", State(), max_components=2)
+        context.set_session(session)
+
+        Counter()
+        assert await commit(session, count=1) == ["counter"]
+
+        Plain()
+        Plain()
+        assert session.find_component("counter") is None
+        assert await commit(session, count=2) == []
+        assert session.state._subscriptions == {}
+
+    asyncio.run(main())
+
+
+def test_replaced_component_keeps_only_the_new_subscription():
+    async def main():
+        session = Session("session", State())
+        context.set_session(session)
+
+        Counter()
+        Title()
+        assert await commit(session, count=1) == []
+        assert await commit(session, title="new") == ["counter"]
+
+        # another instance of the same component keeps the container subscribed
+        Title()
+        assert await commit(session, title="newer") == ["counter"]
+
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from fastapi import FastAPI
+
+from lazyfast import BaseState, Component, LazyFastRouter, tags
+from lazyfast.session import SessionStorage
+
+REQUESTS = 20
+ITEMS = 100
+
+
+class State(BaseState):
+    count: int = 0
+
+
+router = LazyFastRouter(
+    state_schema=State,
+    sync_view_executor=ThreadPoolExecutor(max_workers=8),
+    session_max_components=300,
+)
+
+
+@router.component(id="counter", reload_on=[State.count])
+class Counter(Component):
+    def view(self):
+        tags.p("counter")
+
+
+@router.component()
+class Item(Component):
+    index: int
+
+    def view(self):
+        tags.li(str(self.index))
+
+
+@router.page("/")
+def index():
+    Counter()
+    with tags.ul():
+        for i in range(ITEMS):
+            Item(index=i)
+
+
+def test_concurrent_sync_views_share_one_session():
+    app = FastAPI()
+    app.include_router(router)
+
+    async def main():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            await client.get("/")
+            session = await SessionStorage.get_session(client.cookies["sid"])
+            done = False
+
+            async def use_session_on_the_loop() -> int:
+                commits = 0
+                while not done:
+                    async with session.state:
+                        session.state.count += 1
+                    commits += 1
+                    session.find_component("counter")
+                    await asyncio.sleep(0)
+                return commits
+
+            loop_task = asyncio.create_task(use_session_on_the_loop())
+            responses = await asyncio.gather(*(client.get("/") for _ in range(REQUESTS)))
+            done = True
+            assert await loop_task > 0
+            latest = await client.get("/")
+
+        for response in responses:
+            assert response.status_code == 200
+            # no tags of the other pages rendered at the same time
+            assert response.text.count("__cid__=") == ITEMS + 1
+
+        # the registry stayed consistent: bounded, and every container points to a live component
+        assert len(session._components) == 300
+        for container_id, component_id in session._containers.items():
+            assert session._components[component_id].container_id == container_id
+        assert session.state._subscriptions == {"count": {"counter"}}
+        assert session.find_component("counter") is not None
+
+        # the components of the latest page are registered, and can be loaded
+        component_id = re.findall(r"__cid__=(\w+)", latest.text)[-1]
+        assert session.get_component(component_id).index == ITEMS - 1
+
+    asyncio.run(main())
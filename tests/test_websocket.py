@@ -0,0 +1,102 @@
+import asyncio
+import re
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+
+from lazyfast import Component, LazyFastRouter, ReloadRequest, context, tags
+from lazyfast.session import Session, SessionStorage
+
+router = LazyFastRouter(websocket_transport=True)
+editor_rendering = None
+preview_reloaded = None
+
+
+@router.component(id="editor")
+class Editor(Component):
+    async def view(self, request: ReloadRequest = Depends()):
+        if request.method == "POST":
+            editor_rendering.set()
+            await preview_reloaded.wait()
+
+        tags.input(name="q")
+
+
+@router.component(id="preview")
+class Preview(Component):
+    async def view(self):
+        tags.input(name="q")
+
+
+@router.page("/")
+def index():
+    Editor()
+    Preview()
+
+
+async def reload_over_websocket(
+    app: FastAPI, session: Session, component_id: str, inputs: dict[str, str]
+) -> dict:
+    """What the WebSocket of the session does for a reload message"""
+
+    async def receive_empty_body():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    context.set_session(session)
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/__lazyfast__/ws",
+            "headers": [],
+            "query_string": b"",
+            "app": app,
+            "state": {"session": session},
+        },
+        receive_empty_body,
+    )
+    await editor_rendering.wait()
+    message = await router._reload_over_websocket(
+        request, session, {"cid": component_id, "inputs": inputs}
+    )
+    preview_reloaded.set()
+    return message
+
+
+def test_websocket_reload_keeps_the_inputs_of_a_request_in_flight():
+    app = FastAPI()
+    app.include_router(router)
+
+    async def main():
+        global editor_rendering, preview_reloaded
+        editor_rendering = asyncio.Event()
+        preview_reloaded = asyncio.Event()
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            page = (await client.get("/")).text
+            editor_url = (
+                re.search(r'hx-post="([^"]*/Editor\?[^"]+)"', page)
+                .group(1)
+                .replace("&amp;", "&")
+            )
+            preview_cid = re.search(r'/Preview\?__cid__=(\w+)', page).group(1)
+            csrf = re.search(r'value="([0-9a-f]{64})"', page).group(1)
+            session = await SessionStorage.get_session(client.cookies["sid"])
+
+            reload = asyncio.ensure_future(
+                reload_over_websocket(
+                    app, session, preview_cid, {"csrf": csrf, "q": "from_websocket"}
+                )
+            )
+            response = await client.post(
+                editor_url, data={"csrf": csrf, "q": "typed_in_editor"}
+            )
+
+            assert 'value="typed_in_editor"' in response.text
+            message = await reload
+            assert message["type"] == "html"
+            assert 'value="from_websocket"' in message["html"]
+
+    asyncio.run(main())